@@ -1,11 +1,26 @@
 #!/usr/bin/env python3
 """
 emulation_utils.py
-Fonctions de calcul pures — sans dépendances externes (pas de Mininet, pas de FRR).
+Fonctions de calcul pures — sans Mininet ni FRR (NumPy, SciPy optionnel).
 Importées par isis_routing.py, isis_metrics_collector.py, mininet_gs_timeseries.py
 et les tests unitaires.
 """
 
+import heapq
+import multiprocessing
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+except ImportError:
+    csgraph_dijkstra = None
+
 
 # ── Adressage ISIS ────────────────────────────────────────────────────────────
 
@@ -104,3 +119,278 @@ def compute_gs_subnet(link_counter: int) -> str:
     second = 168 + (link_counter // 256) % 87
     third = link_counter % 256
     return f"192.{second}.{third}"
+
+
+# ── Paramètres tc netem ───────────────────────────────────────────────────────
+
+# Qdisc créée par Mininet TCIntf pour un lien avec bw + delay :
+# htb racine 5:0 → classe 5:1 → netem handle 10: (limit = max_queue_size)
+NETEM_PARENT = "5:1"
+NETEM_HANDLE = "10:"
+
+def format_delay(latency_ms: float) -> str:
+    """
+    Formate une latence pour tc netem / TCLink (ex: 3.412 → '3.412ms').
+    Appelée une seule fois par échantillon au chargement : la boucle de mise
+    à jour réutilise les chaînes pré-calculées.
+    """
+    return f"{latency_ms:.3f}ms"
+
+
+def netem_change_args(interface: str, delay: str, limit: int) -> str:
+    """
+    Arguments tc pour modifier en place la qdisc netem d'une interface
+    (sans 'tc' en tête, utilisable tel quel dans un `tc -batch`).
+
+    `change` sur le handle existant conserve la file d'attente du noyau,
+    contrairement à del+add. `limit` est répété car netem le réinitialise
+    (1000 par défaut) s'il est omis.
+    """
+    return netem_change_template(interface, limit) % delay
+
+
+def netem_change_template(interface: str, limit: int) -> str:
+    """
+    Gabarit de netem_change_args avec le délai en '%s', à construire une fois
+    par interface : à chaque tick, seule la substitution du délai reste.
+    """
+    return (f"qdisc change dev {interface} parent {NETEM_PARENT} "
+            f"handle {NETEM_HANDLE} netem delay %s limit {limit}")
+
+
+# ── Recherche d'échantillons ──────────────────────────────────────────────────
+
+def closest_sample_index(timestamps, target_time, lo=0):
+    """
+    Indice de l'échantillon le plus proche de target_time (dichotomie, O(log N)).
+    En cas d'égalité, le premier échantillon est retenu.
+
+    Args:
+        timestamps:  liste triée des timestamps
+        target_time: temps recherché
+        lo: indice de départ de la recherche — passer le résultat précédent
+            quand target_time avance de façon monotone (coût amorti O(1))
+
+    Returns:
+        int ou None si la série est vide
+    """
+    n = len(timestamps)
+    if n == 0:
+        return None
+    if lo >= n or timestamps[lo] > target_time:
+        lo = 0  # le temps a reculé (nouvelle orbite) : recherche complète
+
+    i = bisect_left(timestamps, target_time, lo)
+    if i == 0:
+        return 0
+    if i == n:
+        return n - 1
+    if target_time - timestamps[i - 1] <= timestamps[i] - target_time:
+        return i - 1
+    return i
+
+
+# ── Mise à jour des latences ISL ──────────────────────────────────────────────
+
+def shared_sample_grid(series_timestamps):
+    """
+    Grille temporelle commune à plusieurs séries d'échantillons, si elle existe.
+
+    La matrice latence[lien, échantillon] indexée par une seule colonne n'est
+    exacte que si toutes les séries ont exactement les mêmes timestamps (cas
+    de l'export JS) : sinon l'échantillon le plus proche d'un temps hors
+    grille diffère d'un lien à l'autre, et la recherche doit se faire lien
+    par lien.
+
+    Args:
+        series_timestamps: liste de séries de timestamps triés
+
+    Returns:
+        np.ndarray (float64, S) ou None si les séries ne partagent pas la même grille
+    """
+    if not series_timestamps:
+        return np.empty(0)
+    first = series_timestamps[0]
+    if any(ts != first for ts in series_timestamps[1:]):
+        return None
+    return np.asarray(first, dtype=np.float64)
+
+
+def compute_latency_updates(latencies, last_sent, threshold=0.001):
+    """
+    Retourne les liens dont la latence a changé depuis le dernier envoi.
+
+    Args:
+        latencies: latences courantes de tous les liens (colonne de la
+                   matrice latence[lien, échantillon])
+        last_sent: dernière latence appliquée par lien (inf = jamais)
+        threshold: variation minimale (ms) déclenchant une mise à jour
+
+    Returns:
+        np.ndarray: indices des liens à mettre à jour
+    """
+    return np.flatnonzero(np.abs(latencies - last_sent) > threshold)
+
+
+# ── Routage statique (plus courts chemins ISL) ────────────────────────────────
+
+def compute_next_hops(isl_links, default_latency_ms=5.0):
+    """
+    Calcule la table de prochains sauts entre tous les satellites.
+    Chaque ISL est pondéré par la latence de son premier échantillon.
+
+    Avec SciPy, tous les plus courts chemins sont calculés en un seul appel
+    C (csgraph.dijkstra sur une matrice creuse) ; sinon, un Dijkstra heapq
+    par source.
+
+    Le résultat est mis en cache par topologie (liste d'arêtes pondérées) :
+    relancer `routing simple` sur les mêmes données ne refait aucun Dijkstra.
+    La table retournée est partagée et ne doit pas être modifiée.
+
+    Args:
+        isl_links: liste des liens ISL du JSON (satA, satB, timeSeries)
+        default_latency_ms: poids d'un lien sans échantillon
+
+    Returns:
+        {source: {dest: next_hop}} avec des noms 'sat<N>'
+    """
+    edges = []
+    for link in isl_links:
+        timeseries = link.get('timeSeries', [])
+        latency = timeseries[0]['latency_ms'] if timeseries else default_latency_ms
+        edges.append((link['satA'], link['satB'], latency))
+
+    return _next_hops_cached(tuple(edges))
+
+
+@lru_cache(maxsize=8)
+def _next_hops_cached(edges):
+    """Table de prochains sauts pour une topologie donnée (tuple de (satA, satB, latence))"""
+    # Nœuds internés en entiers 0..N-1 ; les noms 'sat<N>' ne sont rebâtis qu'à la fin
+    names = []
+    index = {}
+    rows, cols, weights = [], [], []  # arcs dans les deux sens (format COO)
+    for a, b, latency in edges:
+        for sat in (a, b):
+            if sat not in index:
+                index[sat] = len(names)
+                names.append(f"sat{sat}")
+        u, v = index[a], index[b]
+        rows += (u, v)
+        cols += (v, u)
+        weights += (latency, latency)
+
+    n = len(names)
+    if csgraph_dijkstra is not None:
+        first_hops = _first_hops_csgraph(n, rows, cols, weights)
+    else:
+        adj = [[] for _ in range(n)]  # adj[u] = [(v, latence), ...]
+        for u, v, w in zip(rows, cols, weights):
+            adj[u].append((v, w))
+        first_hops = _first_hops_heapq(adj)
+
+    return {
+        names[src]: {names[dst]: names[hop] for dst, hop in hops.items()}
+        for src, hops in enumerate(first_hops)
+    }
+
+
+def _first_hops_csgraph(n, rows, cols, weights):
+    """
+    Tous les plus courts chemins en un appel SciPy, puis premiers sauts via les prédécesseurs.
+    La matrice CSR est construite directement depuis les tableaux d'arcs (COO).
+    """
+    if not weights:
+        return [{} for _ in range(n)]
+
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # Liens parallèles : ne garder que le plus court (la matrice creuse les additionnerait)
+    order = np.lexsort((weights, cols, rows))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+    keep = np.ones(len(rows), dtype=bool)
+    keep[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+
+    matrix = csr_matrix((weights[keep], (rows[keep], cols[keep])), shape=(n, n))
+    dist, pred = csgraph_dijkstra(matrix, directed=True, return_predecessors=True)
+
+    result = []
+    for s in range(n):
+        first_hop = {}
+        # Par distance croissante, le premier saut du prédécesseur est déjà connu
+        for d in np.argsort(dist[s], kind='stable').tolist():
+            p = pred[s, d]
+            if d == s or p < 0:
+                continue
+            first_hop[d] = d if p == s else first_hop[p]
+        result.append(first_hop)
+
+    return result
+
+
+# En dessous de ce nombre de nœuds, démarrer des processus coûte plus que le calcul
+PARALLEL_MIN_NODES = 256
+
+_worker_adj = None  # graphe partagé par les processus du pool (voir _init_worker)
+
+
+def _first_hops_heapq(adj):
+    """
+    Dijkstra heapq depuis chaque source (repli sans SciPy).
+    Les sources sont indépendantes : sur les grands graphes, elles sont
+    réparties sur un pool de processus (le graphe est transmis une seule
+    fois par processus via l'initializer). Les workers sont démarrés par un
+    forkserver et non par fork : l'appelant (commande `routing simple`) peut
+    avoir d'autres threads actifs (updater, collecteur).
+    """
+    n = len(adj)
+    workers = os.cpu_count() or 1
+    if n < PARALLEL_MIN_NODES or workers < 2:
+        return [_sssp_first_hops(adj, source) for source in range(n)]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("forkserver"),
+                             initializer=_init_worker, initargs=(adj,)) as executor:
+        return list(executor.map(_worker_first_hops, range(n),
+                                 chunksize=max(1, n // (workers * 4))))
+
+
+def _init_worker(adj):
+    global _worker_adj
+    _worker_adj = adj
+
+
+def _worker_first_hops(source):
+    return _sssp_first_hops(_worker_adj, source)
+
+
+def _sssp_first_hops(adj, source):
+    """
+    Dijkstra heapq depuis une source.
+    Le premier saut est propagé pendant la relaxation : un seul parcours
+    donne les prochains sauts vers toutes les destinations.
+    Les entrées du tas sont des (float, int) : comparaisons sans chaînes.
+
+    Returns:
+        {dest: first_hop}
+    """
+    n = len(adj)
+    dist = [float('inf')] * n
+    dist[source] = 0
+    first_hop = [-1] * n
+    pq = [(0, source)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        hop_u = first_hop[u]
+        for v, w in adj[u]:
+            if d + w < dist[v]:
+                dist[v] = d + w
+                first_hop[v] = v if u == source else hop_u
+                heapq.heappush(pq, (dist[v], v))
+
+    return {d: h for d, h in enumerate(first_hop) if h >= 0 and d != source}
@@ -15,7 +15,8 @@ import time
 from pathlib import Path
 from mininet.log import info, warn, error
 
-from emulation_utils import compute_net_address
+from emulation_utils import compute_net_address, compute_next_hops
+from mininet_common import run_batch
 
 
 FRR_CONF_DIR = "/tmp/frr_configs"
@@ -519,84 +520,45 @@ class SimpleRoutingManager:
     def compute_routes_from_json(self, data):
         """
         Compute static routes based on JSON topology
-        Uses simple shortest path calculation
+        Uses shortest path calculation (see emulation_utils.compute_next_hops)
         """
-        from collections import defaultdict
-        import heapq
-
-        # Build adjacency list from ISL links
-        graph = defaultdict(list)
-
-        for link in data.get('islLinks', []):
-            sat_a = f"sat{link['satA']}"
-            sat_b = f"sat{link['satB']}"
-            timeseries = link.get('timeSeries', [])
-            latency = timeseries[0]['latency_ms'] if timeseries else 5.0
-
-            graph[sat_a].append((sat_b, latency))
-            graph[sat_b].append((sat_a, latency))
-
-        # Compute shortest paths from each node using Dijkstra
-        nodes = list(graph.keys())
-
-        for source in nodes:
-            dist = {node: float('inf') for node in nodes}
-            dist[source] = 0
-            prev = {node: None for node in nodes}
-            pq = [(0, source)]
-
-            while pq:
-                d, u = heapq.heappop(pq)
-                if d > dist[u]:
-                    continue
-                for v, w in graph[u]:
-                    if dist[u] + w < dist[v]:
-                        dist[v] = dist[u] + w
-                        prev[v] = u
-                        heapq.heappush(pq, (dist[v], v))
-
-            # Store next-hop for each destination
-            self.routes[source] = {}
-            for dest in nodes:
-                if dest != source and prev[dest]:
-                    # Trace back to find first hop
-                    hop = dest
-                    while prev[hop] != source:
-                        hop = prev[hop]
-                    self.routes[source][dest] = hop
+        self.routes = compute_next_hops(data.get('islLinks', []))
 
     def install_routes(self):
         """Install computed routes on all hosts"""
         info("*** Installing static routes...\n")
 
+        # Adresses de chaque host, relevées une fois (et non par route)
+        host_ips = {
+            h.name: [ip for ip in (intf.IP() for intf in h.intfList())
+                     if ip and ip != '127.0.0.1']
+            for h in self.net.hosts
+        }
+
         for source, destinations in self.routes.items():
             host = self.net.get(source)
             if not host:
                 continue
 
+            # IP du voisin de l'autre côté de chaque lien : {peer_name: next_hop_ip}
+            next_hop_ips = {}
+            for intf in host.intfList():
+                if intf.link:
+                    link = intf.link
+                    peer_intf = link.intf2 if link.intf1.node == host else link.intf1
+                    next_hop_ips.setdefault(peer_intf.node.name, peer_intf.IP())
+
+            lines = []
             for dest, next_hop in destinations.items():
-                next_host = self.net.get(next_hop)
-                if not next_host:
+                next_hop_ip = next_hop_ips.get(next_hop)
+                if not next_hop_ip:
                     continue
 
-                # Find the interface to next_hop
-                for intf in host.intfList():
-                    if intf.link:
-                        link = intf.link
-                        peer = link.intf2.node if link.intf1.node == host else link.intf1.node
-                        if peer.name == next_hop:
-                            # Get next-hop IP
-                            peer_intf = link.intf2 if link.intf1.node == host else link.intf1
-                            next_hop_ip = peer_intf.IP()
-                            if next_hop_ip:
-                                # Get destination network
-                                dest_host = self.net.get(dest)
-                                for dest_intf in dest_host.intfList():
-                                    dest_ip = dest_intf.IP()
-                                    if dest_ip and dest_ip != '127.0.0.1':
-                                        # Add route
-                                        host.cmd(f'ip route add {dest_ip}/32 via {next_hop_ip}')
-                            break
+                for dest_ip in host_ips.get(dest, []):
+                    lines.append(f'route add {dest_ip}/32 via {next_hop_ip}')
+
+            # Toutes les routes du host en un seul `ip -batch`
+            run_batch(host, 'ip', lines)
 
         info("*** Static routes installed\n")
 
@@ -15,6 +15,13 @@ import subprocess
 from pathlib import Path
 from mininet.log import info, warn, error
 
+try:
+    import orjson  # parseur C, nettement plus rapide sur les gros exports timeseries
+except ImportError:
+    orjson = None
+
+from emulation_utils import format_delay, netem_change_args
+
 
 def load_json_data(json_file):
     """
@@ -35,8 +42,9 @@ def load_json_data(json_file):
     if not path.exists():
         raise FileNotFoundError(f"File not found: {json_file}")
 
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    raw = path.read_bytes()
+    # orjson.JSONDecodeError hérite de json.JSONDecodeError
+    data = orjson.loads(raw) if orjson else json.loads(raw)
 
     # Validation basique
     if 'metadata' not in data:
@@ -128,32 +136,31 @@ def display_constellation_info(data):
         info("\n")
 
 
-def update_link_latency_tc(interface, latency_ms, host=None):
+def update_link_latency_tc(interface, latency_ms, host=None, delay=None, limit=1000):
     """
-    Met à jour la latence d'une interface réseau avec tc netem
+    Met à jour la latence d'une interface réseau avec tc netem.
+    La qdisc netem créée par TCLink est modifiée en place (`tc qdisc change`),
+    sans suppression/recréation qui viderait la file d'attente.
 
     Args:
         interface: Nom de l'interface (ex: 'sat0-eth0')
         latency_ms: Latence en millisecondes
         host: Host Mininet (si fourni, exécute via le namespace du host)
+        delay: Délai netem pré-formaté (ex: '3.412ms'), évite le formatage à chaque tick
+        limit: Taille de file netem (max_queue_size du lien), conservée lors du change
 
     Returns:
         bool: True si la mise à jour a réussi, False sinon
     """
+    if delay is None:
+        delay = format_delay(latency_ms)
+
+    args = netem_change_args(interface, delay, limit)
+
     try:
         if host:
             # Exécuter via le namespace du host Mininet
-            # Vérifier si une qdisc netem existe
-            result = host.cmd(f'tc qdisc show dev {interface}')
-
-            if 'netem' in result:
-                cmd = f'tc qdisc change dev {interface} root netem delay {latency_ms:.3f}ms'
-            else:
-                # Supprimer l'existante et créer une nouvelle
-                host.cmd(f'tc qdisc del dev {interface} root 2>/dev/null')
-                cmd = f'tc qdisc add dev {interface} root netem delay {latency_ms:.3f}ms'
-
-            result = host.cmd(cmd)
+            result = host.cmd(f'tc {args}')
             if 'Error' in result or 'error' in result:
                 # Silently ignore - interface may have been removed
                 return False
@@ -162,26 +169,7 @@ def update_link_latency_tc(interface, latency_ms, host=None):
         else:
             # Fallback: exécuter directement (ancien comportement)
             result = subprocess.run(
-                ['tc', 'qdisc', 'show', 'dev', interface],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
-            if 'netem' in result.stdout:
-                cmd = ['tc', 'qdisc', 'change', 'dev', interface,
-                       'root', 'netem', 'delay', f'{latency_ms:.3f}ms']
-            else:
-                subprocess.run(
-                    ['tc', 'qdisc', 'del', 'dev', interface, 'root'],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-                cmd = ['tc', 'qdisc', 'add', 'dev', interface,
-                       'root', 'netem', 'delay', f'{latency_ms:.3f}ms']
-
-            result = subprocess.run(
-                cmd,
+                ['tc'] + args.split(),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True
@@ -215,46 +203,43 @@ def get_host_interfaces(host):
     return interfaces
 
 
-
-def find_interface_for_link(host, peer_host):
+def run_batch(host, program, lines):
     """
-    Trouve l'interface d'un host connectée à un autre host
+    Exécute plusieurs commandes `ip` ou `tc` en un seul appel `-batch`
+    dans le namespace du host (un seul processus au lieu d'un par commande).
+    Le programme est lancé avec une liste d'arguments (host.popen) et reçoit
+    les commandes sur stdin : pas de shell intermédiaire ni de quoting.
 
     Args:
-        host: Host source
-        peer_host: Host destination
+        host: Host Mininet
+        program: 'ip' ou 'tc'
+        lines: Liste de commandes sans le nom du programme (ex: 'link set sat0-eth0 up')
 
     Returns:
-        str: Nom de l'interface ou None si non trouvée
+        str: Sortie de la commande (vide si tout s'est bien passé)
     """
-    for intf in host.intfList():
-        if intf.link:
-            # Vérifier si le lien connecte au peer
-            link = intf.link
-            if link.intf1.node == peer_host or link.intf2.node == peer_host:
-                return intf.name
-    return None
-
+    if not lines:
+        return ''
 
-class LinkLatencyCache:
-    """Cache pour les latences des liens, évite les appels tc répétés"""
+    # -force : continuer malgré une interface déjà supprimée (handover rapide)
+    proc = host.popen([program, '-force', '-batch', '-'],
+                      stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                      stderr=subprocess.STDOUT)
+    output, _ = proc.communicate(('\n'.join(lines) + '\n').encode())
+    return output.decode(errors='replace')
 
-    def __init__(self):
-        self.cache = {}  # {interface: last_latency_ms}
-        self.tolerance = 0.001  # Tolérance de 1 microseconde
 
-    def should_update(self, interface, new_latency_ms):
-        """Vérifie si la latence a changé significativement"""
-        if interface not in self.cache:
-            return True
+def set_interfaces_up(host, interfaces):
+    """
+    Active plusieurs interfaces d'un host en un seul appel `ip -batch`
+    (une seule commande dans le namespace au lieu d'un `ifconfig` par interface)
 
-        old_latency = self.cache[interface]
-        return abs(new_latency_ms - old_latency) > self.tolerance
+    Args:
+        host: Host Mininet
+        interfaces: Liste des noms d'interfaces à activer
 
-    def update(self, interface, latency_ms):
-        """Met à jour le cache"""
-        self.cache[interface] = latency_ms
+    Returns:
+        str: Sortie de la commande ip (vide si tout s'est bien passé)
+    """
+    return run_batch(host, 'ip', [f'link set {intf} up' for intf in interfaces])
 
-    def clear(self):
-        """Vide le cache"""
-        self.cache.clear()
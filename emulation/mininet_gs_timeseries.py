@@ -21,9 +21,12 @@ Format JSON v4.0:
 
 import json
 import os
+import queue
 import sys
 import threading
 import time
+from pathlib import Path
+import numpy as np
 from mininet.net import Mininet
 from mininet.link import TCLink
 from mininet.log import setLogLevel, info, warn, error
@@ -38,12 +41,23 @@ from mininet_common import (
     get_gs_links,
     display_constellation_info,
     update_link_latency_tc,
-    find_interface_for_link,
-    LinkLatencyCache
+    run_batch,
+    set_interfaces_up
 )
 from isis_routing import setup_isis_network, stop_isis_network, setup_simple_routing, update_isis_for_new_link
 from isis_metrics_collector import ISISMetricsCollector
-from emulation_utils import compute_isl_subnet, compute_gs_subnet
+from emulation_utils import (
+    compute_isl_subnet,
+    compute_gs_subnet,
+    format_delay,
+    shared_sample_grid,
+    compute_latency_updates,
+    closest_sample_index,
+    netem_change_template
+)
+
+ISL_QUEUE_SIZE = 1000   # max_queue_size (netem limit) des liens ISL
+GS_QUEUE_SIZE = 500     # max_queue_size (netem limit) des liens GS
 
 
 class DynamicGSLinkManager:
@@ -60,6 +74,53 @@ class DynamicGSLinkManager:
         self.link_counter = 50000       # Compteur pour les sous-réseaux GS (éviter collision avec ISL)
         self._handover_callbacks = []   # Callbacks called before handover
         self._connect_callbacks = []    # Callbacks called after successful connect
+        self._batching = False          # True entre begin_batch() et flush_batch()
+        self._pending_up = {}           # {host: [intf, ...]} interfaces à activer au flush
+        self._pending_connects = []     # [(gs_id, sat_id, latency_ms)] callbacks différés
+
+    def begin_batch(self):
+        """
+        Démarre un lot de connexions: l'activation des interfaces et les
+        callbacks de connexion sont différés jusqu'à flush_batch()
+        """
+        self._batching = True
+
+    def flush_batch(self):
+        """
+        Active toutes les interfaces en attente (un seul `ip -batch` par namespace)
+        puis notifie les callbacks de connexion dans l'ordre des événements
+        """
+        self._batching = False
+        self._flush_pending()
+
+    def _flush_pending_for(self, gs_id):
+        """
+        Vide le lot courant si la GS y a une connexion en attente, pour que
+        ses callbacks de connexion passent avant un handover/disconnect
+        (ordre des événements conservé). Le lot reste ouvert.
+        """
+        if any(p[0] == gs_id for p in self._pending_connects):
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Active les interfaces en attente et notifie les connexions différées"""
+        pending_up, self._pending_up = self._pending_up, {}
+        pending_connects, self._pending_connects = self._pending_connects, []
+
+        for host, interfaces in pending_up.items():
+            set_interfaces_up(host, interfaces)
+
+        for gs_id, sat_id, latency_ms in pending_connects:
+            info(f"[GS CONNECT] {gs_id} <-> sat{sat_id} (latency: {latency_ms:.3f}ms)\n")
+            self._notify_connect(gs_id, sat_id, latency_ms)
+
+    def _notify_connect(self, gs_id, sat_id, latency_ms):
+        """Notifie les callbacks de connexion (appelé une fois le lien actif)"""
+        for cb in self._connect_callbacks:
+            try:
+                cb(gs_id, sat_id, latency_ms)
+            except Exception as cb_e:
+                print(f"*** Connect callback error: {cb_e}", flush=True)
 
     def connect(self, gs_id, sat_id, latency_ms):
         """
@@ -100,9 +161,9 @@ class DynamicGSLinkManager:
                 sat_host,
                 params1={'ip': ip_gs},
                 params2={'ip': ip_sat},
-                delay=f'{latency_ms:.3f}ms',
+                delay=format_delay(latency_ms),
                 bw=100,  # 100 Mbps pour les liens GS
-                max_queue_size=500
+                max_queue_size=GS_QUEUE_SIZE
             )
 
             # Restore stderr
@@ -114,10 +175,6 @@ class DynamicGSLinkManager:
             intf_gs = link.intf1.name
             intf_sat = link.intf2.name
 
-            # Activer les interfaces
-            gs_host.cmd(f'ifconfig {intf_gs} up')
-            sat_host.cmd(f'ifconfig {intf_sat} up')
-
             # Stocker les informations du lien
             self.active_links[gs_id] = {
                 'sat_id': sat_id,
@@ -128,14 +185,20 @@ class DynamicGSLinkManager:
                 'ip_sat': ip_sat
             }
 
+            # Activer les interfaces (différé au flush si un lot est en cours)
+            if self._batching:
+                self._pending_up.setdefault(gs_host, []).append(intf_gs)
+                self._pending_up.setdefault(sat_host, []).append(intf_sat)
+                self._pending_connects.append((gs_id, sat_id, latency_ms))
+                return True
+
+            set_interfaces_up(gs_host, [intf_gs])
+            set_interfaces_up(sat_host, [intf_sat])
+
             info(f"[GS CONNECT] {gs_id} <-> sat{sat_id} (latency: {latency_ms:.3f}ms)\n")
 
             # Notify connect callbacks AFTER link is up
-            for cb in self._connect_callbacks:
-                try:
-                    cb(gs_id, sat_id, latency_ms)
-                except Exception as cb_e:
-                    print(f"*** Connect callback error: {cb_e}", flush=True)
+            self._notify_connect(gs_id, sat_id, latency_ms)
 
             return True
 
@@ -154,6 +217,8 @@ class DynamicGSLinkManager:
             warn(f"GS {gs_id} not connected\n")
             return False
 
+        self._flush_pending_for(gs_id)
+
         link_info = self.active_links[gs_id]
         sat_id = link_info['sat_id']
 
@@ -191,6 +256,9 @@ class DynamicGSLinkManager:
         """
         info(f"[GS HANDOVER] {gs_id}: sat{from_sat_id} -> sat{to_sat_id}\n")
 
+        # Une connexion de la même fenêtre doit être notifiée avant le handover
+        self._flush_pending_for(gs_id)
+
         # Notify callbacks BEFORE disconnect (so measurement threads are ready)
         for cb in self._handover_callbacks:
             try:
@@ -204,13 +272,14 @@ class DynamicGSLinkManager:
         # Connexion au nouveau satellite
         return self.connect(gs_id, to_sat_id, latency_ms)
 
-    def update_latency(self, gs_id, latency_ms):
+    def update_latency(self, gs_id, latency_ms, delay=None):
         """
         Mettre à jour la latence d'un lien GS actif
 
         Args:
             gs_id: ID de la ground station
             latency_ms: Nouvelle latence
+            delay: Délai netem pré-formaté (optionnel)
         """
         if gs_id not in self.active_links:
             return False
@@ -224,8 +293,10 @@ class DynamicGSLinkManager:
         sat_host = self.sat_hosts.get(link_info['sat_id'])
 
         # Mettre à jour les deux directions
-        success_gs = update_link_latency_tc(intf_gs, latency_ms, host=gs_host)
-        success_sat = update_link_latency_tc(intf_sat, latency_ms, host=sat_host)
+        success_gs = update_link_latency_tc(intf_gs, latency_ms, host=gs_host,
+                                            delay=delay, limit=GS_QUEUE_SIZE)
+        success_sat = update_link_latency_tc(intf_sat, latency_ms, host=sat_host,
+                                             delay=delay, limit=GS_QUEUE_SIZE)
 
         return success_gs and success_sat
 
@@ -240,7 +311,8 @@ class DynamicLatencyUpdater:
     Boucle sur la période orbitale et applique les mises à jour tc
     """
 
-    def __init__(self, net, isl_links, gs_links_data, gs_manager, update_interval=20):
+    def __init__(self, net, isl_links, gs_links_data, gs_manager, update_interval=20,
+                 isl_link_map=None):
         self.net = net
         self.isl_links = isl_links
         self.gs_links_data = gs_links_data
@@ -249,36 +321,81 @@ class DynamicLatencyUpdater:
         self.running = False
         self.current_time = 0
         self.thread = None
-        self.latency_cache = LinkLatencyCache()
+        self.latency_tolerance = 0.001  # Tolérance de 1 microseconde
         self.orbit_completed = threading.Event()  # Signaled when one full orbit is done
         self.speed_factor = 1  # 1 = real-time, 100 = x100, etc.
+        self.errors = queue.Queue()  # Exceptions du thread, remontées au thread principal
 
-        # Indexer les time series ISL (seulement ceux avec timeseries)
-        self.isl_timeseries_map = {}
+        # Indexer les time series ISL (seulement ceux avec timeseries) en
+        # Structure of Arrays : latence[lien, échantillon] sur une grille temporelle commune
+        self.isl_keys = []       # [(satA, satB)] ordre des lignes de la matrice
         self.orbital_period_s = 0
+        series_ts, series_lat = [], []
 
         for link in isl_links:
             timeseries = link.get('timeSeries', [])
             # Seulement indexer les liens qui ont des timeseries (ceux créés dans Mininet)
             if timeseries:
-                key = (link['satA'], link['satB'])
-                self.isl_timeseries_map[key] = timeseries
+                timeseries = sorted(timeseries, key=lambda s: s['timestamp'])
+                self.isl_keys.append((link['satA'], link['satB']))
+                series_ts.append([s['timestamp'] for s in timeseries])
+                series_lat.append([s['latency_ms'] for s in timeseries])
                 self.orbital_period_s = max(
                     self.orbital_period_s,
                     timeseries[-1]['timestamp']
                 )
 
+        # Matrice latence[lien, échantillon] seulement si tous les liens partagent
+        # exactement la même grille ; sinon recherche de l'échantillon lien par lien
+        self.isl_grid = shared_sample_grid(series_ts)
+        if self.isl_grid is not None:
+            self.isl_grid_list = self.isl_grid.tolist()  # pour la dichotomie scalaire
+            shape = (len(series_lat), len(self.isl_grid))
+            self.isl_lat_matrix = np.array(series_lat, dtype=np.float64).reshape(shape)
+            self.isl_delay_matrix = np.empty(shape, dtype=object)  # délais netem pré-formatés
+            for row, lat in enumerate(series_lat):
+                self.isl_delay_matrix[row] = [format_delay(x) for x in lat]
+            self._isl_col = 0  # dernière colonne utilisée (le temps avance de façon monotone)
+        else:
+            warn("*** ISL timeseries are not sampled on a common grid: per-link sample lookup\n")
+            self.isl_series_ts = series_ts
+            self.isl_series_lat = [np.asarray(lat, dtype=np.float64) for lat in series_lat]
+            self.isl_series_delays = [[format_delay(x) for x in lat] for lat in series_lat]
+            self._isl_cols = [0] * len(series_ts)  # dernier indice par lien
+        self.isl_last_sent = np.full(len(self.isl_keys), np.inf)  # dernière latence appliquée
+
+        # Extrémités de chaque lien ISL (host_a, tc_a, host_b, tc_b), lues une fois depuis
+        # les objets Link de create_network au lieu d'être recherchées à chaque tick.
+        # tc_a/tc_b : gabarits de commande tc par interface, seul le délai reste à insérer
+        isl_link_map = isl_link_map or {}
+        self.isl_endpoints = []
+        for key in self.isl_keys:
+            mn_link = isl_link_map.get(key)
+            if mn_link:
+                intf1, intf2 = mn_link.intf1, mn_link.intf2
+                self.isl_endpoints.append((intf1.node, netem_change_template(intf1.name, ISL_QUEUE_SIZE),
+                                           intf2.node, netem_change_template(intf2.name, ISL_QUEUE_SIZE)))
+            else:
+                self.isl_endpoints.append(None)
+
         # Indexer les événements GS par temps
         self.gs_events = gs_links_data.get('events', [])
         self.gs_events_sorted = sorted(self.gs_events, key=lambda e: e['t'])
 
-        # Indexer les timelines GS
-        self.gs_timeline_map = {}  # {gs_id: [{satId, samples}]}
+        # Indexer les timelines GS (échantillons triés par temps pour la dichotomie)
+        self.gs_timeline_map = {}  # {gs_id: [{satId, samples, ts, delays, last_idx}]}
         for entry in gs_links_data.get('timeline', []):
             gs_id = entry['gsId']
             if gs_id not in self.gs_timeline_map:
                 self.gs_timeline_map[gs_id] = []
-            self.gs_timeline_map[gs_id].append(entry)
+            samples = sorted(entry.get('samples', []), key=lambda s: s.get('t', 0))
+            self.gs_timeline_map[gs_id].append(dict(
+                entry,
+                samples=samples,
+                ts=[s.get('t', 0) for s in samples],
+                delays=[format_delay(s['latency_ms']) for s in samples],
+                last_idx=0,
+            ))
 
         # Safety check: ensure orbital period is valid
         if self.orbital_period_s <= 0:
@@ -287,7 +404,7 @@ class DynamicLatencyUpdater:
         else:
             info(f"*** Orbital period detected: {self.orbital_period_s:.0f}s ({self.orbital_period_s/60:.1f} min)\n")
 
-        info(f"*** ISL links with timeseries: {len(self.isl_timeseries_map)}\n")
+        info(f"*** ISL links with timeseries: {len(self.isl_keys)}\n")
         info(f"*** GS Events loaded: {len(self.gs_events)}\n")
 
     def start(self):
@@ -308,10 +425,19 @@ class DynamicLatencyUpdater:
         info("*** Dynamic latency updater stopped\n")
 
     def _update_loop(self):
-        """Boucle principale de mise à jour"""
+        """
+        Boucle principale de mise à jour.
+        Les ticks sont cadencés sur time.monotonic() : la durée des mises à
+        jour tc n'est pas ajoutée à l'intervalle, donc pas de dérive
+        cumulée sur une période orbitale.
+        Un pas en erreur n'est pas rejoué (les événements GS déjà appliqués
+        le seraient deux fois) : l'erreur est journalisée, mise dans
+        self.errors, et le temps simulé avance.
+        """
         import traceback
         print("*** Updater thread started, first update in {}s".format(self.update_interval), flush=True)
         loop_count = 0
+        next_tick = time.monotonic()
         while self.running:
             loop_count += 1
             try:
@@ -319,26 +445,45 @@ class DynamicLatencyUpdater:
                 self._process_gs_events()
                 self._update_isl_latencies()
                 self._update_gs_latencies()
-
-                time.sleep(self.update_interval)
-
-                # Incrémenter le temps
-                self.current_time += self.update_interval
-                if self.current_time >= self.orbital_period_s:
-                    print("*** Orbital period completed!", flush=True)
-                    self.running = False
-                    self.orbit_completed.set()
             except Exception as e:
                 error(f"*** UPDATER ERROR: {e}\n")
                 traceback.print_exc()
-                # Continue running despite errors
-                time.sleep(self.update_interval)
+                # Continue running despite errors, mais signaler au thread principal
+                self.errors.put(e)
+
+            next_tick += self.update_interval
+            time.sleep(max(0, next_tick - time.monotonic()))
+
+            # Incrémenter le temps
+            self.current_time += self.update_interval
+            if self.current_time >= self.orbital_period_s:
+                print("*** Orbital period completed!", flush=True)
+                self.running = False
+                self.orbit_completed.set()
+
+    def pop_errors(self):
+        """Retourne (et vide) les exceptions levées par le thread de mise à jour"""
+        errors = []
+        while True:
+            try:
+                errors.append(self.errors.get_nowait())
+            except queue.Empty:
+                return errors
 
     def _process_gs_events(self):
         """Traite les événements GS pour le temps courant"""
         window_start = self.current_time
         window_end = self.current_time + self.update_interval
 
+        # Regrouper l'activation des interfaces de tous les événements de la fenêtre
+        self.gs_manager.begin_batch()
+        try:
+            self._apply_gs_events(window_start, window_end)
+        finally:
+            self.gs_manager.flush_batch()
+
+    def _apply_gs_events(self, window_start, window_end):
+        """Applique les événements GS de la fenêtre [window_start, window_end["""
         for event in self.gs_events_sorted:
             event_time = event['t']
 
@@ -364,39 +509,57 @@ class DynamicLatencyUpdater:
                     )
 
     def _update_isl_latencies(self):
-        """Met à jour les latences ISL via tc netem"""
+        """Met à jour les latences ISL via tc netem (un `tc -batch` par satellite)"""
         updated_count = 0
-        skipped_count = 0
-
-        for (satA, satB), timeseries in self.isl_timeseries_map.items():
-            sample = self._get_sample_at_time(timeseries, self.current_time)
-
-            if sample:
-                latency = sample['latency_ms']
-
-                # Trouver les interfaces
-                sat_a_host = self.net.get(f'sat{satA}')
-                sat_b_host = self.net.get(f'sat{satB}')
-
-                if sat_a_host and sat_b_host:
-                    intf_a = find_interface_for_link(sat_a_host, sat_b_host)
-                    intf_b = find_interface_for_link(sat_b_host, sat_a_host)
-
-                    if intf_a and intf_b:
-                        # Vérifier le cache pour éviter les mises à jour inutiles
-                        if self.latency_cache.should_update(intf_a, latency):
-                            # Passer le host pour exécuter dans le bon namespace
-                            update_link_latency_tc(intf_a, latency, host=sat_a_host)
-                            update_link_latency_tc(intf_b, latency, host=sat_b_host)
-                            self.latency_cache.update(intf_a, latency)
-                            self.latency_cache.update(intf_b, latency)
-                            updated_count += 1
-                        else:
-                            skipped_count += 1
+
+        sample = self._isl_sample()
+        if sample is None:
+            return
+        latencies, delays = sample
+
+        # Seuls les liens dont la latence a changé remontent
+        links = compute_latency_updates(latencies, self.isl_last_sent, self.latency_tolerance)
+
+        # Regrouper les commandes par host : chaque satellite a son propre namespace
+        batches = {}  # {host: [tc batch lines]}
+        for i in links.tolist():
+            endpoints = self.isl_endpoints[i]
+            if endpoints is None:
+                continue
+
+            sat_a_host, tc_a, sat_b_host, tc_b = endpoints
+            delay = delays[i]
+            batches.setdefault(sat_a_host, []).append(tc_a % delay)
+            batches.setdefault(sat_b_host, []).append(tc_b % delay)
+            self.isl_last_sent[i] = latencies[i]
+            updated_count += 1
+
+        for host, lines in batches.items():
+            run_batch(host, 'tc', lines)
 
         if updated_count > 0:
             print(f"    ISL latencies: {updated_count} changed", flush=True)
 
+    def _isl_sample(self):
+        """
+        (latences, délais) de tous les liens ISL pour le temps courant, ou None.
+        Grille commune : une seule colonne de la matrice. Sinon, échantillon le
+        plus proche lien par lien.
+        """
+        if self.isl_grid is not None:
+            col = closest_sample_index(self.isl_grid_list, self.current_time, self._isl_col)
+            if col is None:
+                return None
+            self._isl_col = col
+            return self.isl_lat_matrix[:, col], self.isl_delay_matrix[:, col]
+
+        cols = [closest_sample_index(ts, self.current_time, lo)
+                for ts, lo in zip(self.isl_series_ts, self._isl_cols)]
+        self._isl_cols = cols
+        latencies = np.array([lat[c] for lat, c in zip(self.isl_series_lat, cols)])
+        delays = [d[c] for d, c in zip(self.isl_series_delays, cols)]
+        return latencies, delays
+
     def _update_gs_latencies(self):
         """Met à jour les latences GS via tc netem"""
         active_connections = self.gs_manager.get_active_connections()
@@ -412,28 +575,50 @@ class DynamicLatencyUpdater:
                         # Vérifier si cette entrée est active
                         if start_time <= self.current_time:
                             if end_time is None or self.current_time < end_time:
-                                sample = self._get_sample_at_time(
-                                    entry['samples'],
-                                    self.current_time,
-                                    time_key='t'
-                                )
-                                if sample:
+                                idx = self._get_sample_index(entry, self.current_time)
+                                if idx is not None:
                                     self.gs_manager.update_latency(
                                         gs_id,
-                                        sample['latency_ms']
+                                        entry['samples'][idx]['latency_ms'],
+                                        delay=entry['delays'][idx]
                                     )
                                 break
 
-    def _get_sample_at_time(self, timeseries, target_time, time_key='timestamp'):
-        """Trouve l'échantillon le plus proche du temps donné"""
-        if not timeseries:
-            return None
+    def export_isl_traces(self, out_dir):
+        """
+        Exporte en une fois la timeline complète de chaque lien ISL, un fichier
+        par lien (sat<A>_sat<B>.trace) avec une ligne 'timestamp_ns delay_ns'
+        par échantillon. Destiné à une qdisc de rejeu de trace
+        côté noyau (type TheaterQ) ; sans elle, la boucle netem reste utilisée.
 
-        closest = min(
-            timeseries,
-            key=lambda s: abs(s.get(time_key, s.get('t', 0)) - target_time)
-        )
-        return closest
+        Returns:
+            int: Nombre de fichiers écrits
+        """
+        out = Path(out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+
+        if self.isl_grid is not None:
+            series = ((self.isl_grid, row) for row in self.isl_lat_matrix)
+        else:
+            series = zip(self.isl_series_ts, self.isl_series_lat)
+
+        for (satA, satB), (ts, lat) in zip(self.isl_keys, series):
+            ts_ns = np.rint(np.asarray(ts, dtype=np.float64) * 1e9).astype(np.int64)
+            delay_ns = np.rint(lat * 1e6).astype(np.int64)
+            np.savetxt(out / f'sat{satA}_sat{satB}.trace',
+                       np.column_stack((ts_ns, delay_ns)), fmt='%d')
+
+        return len(self.isl_keys)
+
+    def _get_sample_index(self, entry, target_time):
+        """
+        Trouve l'indice de l'échantillon le plus proche du temps donné.
+        Reprend la recherche au dernier indice trouvé (le temps avance de façon monotone).
+        """
+        idx = closest_sample_index(entry['ts'], target_time, entry['last_idx'])
+        if idx is not None:
+            entry['last_idx'] = idx
+        return idx
 
 
 def create_network(data):
@@ -444,7 +629,7 @@ def create_network(data):
         data: Données JSON parsées
 
     Returns:
-        tuple: (net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map)
+        tuple: (net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map, isl_link_map)
     """
     info("*** Creating Mininet network with ISL + GS support\n")
     net = Mininet(link=TCLink, controller=None)
@@ -480,6 +665,8 @@ def create_network(data):
 
     # link_map[sat_id] = {label: {'peer': peer_sat, 'intf': interface_name, 'type': link_type, 'bandwidth_mbps': bw}}
     link_map = {}
+    # isl_link_map[(satA, satB)] = Link Mininet (les deux interfaces du lien veth)
+    isl_link_map = {}
     # Track per-sat counters for label assignment: intra-plane -> .1/.2, inter-plane -> .3/.4
     _label_counters = {}  # {sat_id: {'intra-plane': int, 'inter-plane': int}}
 
@@ -514,11 +701,13 @@ def create_network(data):
             sat_hosts[satB],
             params1={'ip': ip_a},
             params2={'ip': ip_b},
-            delay=f'{initial_latency:.3f}ms',
+            delay=format_delay(initial_latency),
             bw=min(bandwidth, 1000),
-            max_queue_size=1000
+            max_queue_size=ISL_QUEUE_SIZE
         )
 
+        isl_link_map[(satA, satB)] = mn_link
+
         # Build link_map entries for both endpoints
         intf_a_name = mn_link.intf1.name
         intf_b_name = mn_link.intf2.name
@@ -560,7 +749,7 @@ def create_network(data):
     # Créer le gestionnaire de liens GS (les liens seront créés dynamiquement)
     gs_manager = DynamicGSLinkManager(net, gs_hosts, sat_hosts)
 
-    return net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map
+    return net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map, isl_link_map
 
 
 def main():
@@ -595,13 +784,14 @@ def main():
     display_constellation_info(data)
 
     # Créer le réseau
-    net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map = create_network(data)
+    net, sat_hosts, gs_hosts, isl_links, gs_manager, link_map, isl_link_map = create_network(data)
 
     # Créer le gestionnaire de latences dynamiques
     gs_links_data = get_gs_links(data) if has_ground_stations(data) else {}
     updater = DynamicLatencyUpdater(
         net, isl_links, gs_links_data, gs_manager,
-        update_interval=20
+        update_interval=20,
+        isl_link_map=isl_link_map
     )
 
     # ISIS: configure ISIS on new GS links when they connect
@@ -694,6 +884,8 @@ def main():
                 print(f"*** Updater running: {updater.running}", flush=True)
                 print(f"*** Current time: {updater.current_time}s", flush=True)
                 print(f"*** Active GS connections: {gs_manager.get_active_connections()}", flush=True)
+                for e in updater.pop_errors():
+                    print(f"*** Updater error: {e!r}", flush=True)
 
             elif command == 'pingall':
                 net.pingAll()
@@ -768,6 +960,11 @@ def main():
                         print("*** Routes for sat0:", flush=True)
                         print(sat0.cmd('ip route'), flush=True)
 
+            elif command == 'traces':
+                out_dir = parts[1] if len(parts) >= 2 else 'isl_traces'
+                count = updater.export_isl_traces(out_dir)
+                print(f"*** {count} ISL traces written to {out_dir}/", flush=True)
+
             elif command == 'dump':
                 for host in net.hosts:
                     print(f"{host.name}: {host.cmd('ifconfig | grep inet | head -5')}", flush=True)
@@ -797,6 +994,7 @@ Commands:
   ping <a> <b>   - Ping from node a to node b (e.g., ping sat0 sat1)
   nodes          - List all nodes
   links          - Show link information
+  traces [dir]   - Export per-link ISL delay traces (default: isl_traces/)
   dump           - Show interface info for all hosts
   quit / exit    - Stop and exit
 """, flush=True)
@@ -5,9 +5,32 @@ import json
 import sys
 import os
 import glob
+from html import escape
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # files only: no GUI toolkit init
 import matplotlib.pyplot as plt
+from matplotlib.collections import PathCollection
+from matplotlib.lines import Line2D
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D, IdentityTransform
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ijson  # optional: streaming parse, unused sections are never built
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+# PNG encoding dominates plot time: lower default DPI (PLOT_DPI overrides)
+# and fast zlib level, at the cost of slightly larger files
+SAVE_KW = dict(dpi=int(os.environ.get("PLOT_DPI", 120)),
+               pil_kwargs={"compress_level": 1})
+
+# Top-level metrics sections used by the plots (spf_events, metadata are not)
+PLOT_SECTIONS = {"summary", "convergence_events", "packet_loss_events",
+                 "service_interruptions", "lsp_measurements", "link_utilization"}
 
 # ── Load data ────────────────────────────────────────────────────────────────
 
@@ -19,52 +42,148 @@ def load_metrics(path=None):
         if not files:
             print("No isis_metrics_*.json file found"); sys.exit(1)
         path = files[-1]
-    with open(path) as f:
-        data = json.load(f)
+    if ijson:
+        with open(path, "rb") as f:
+            data = _load_sections(f, PLOT_SECTIONS)
+    else:
+        with open(path) as f:
+            data = json.load(f)
     print(f"Loaded: {path}")
     return data, os.path.splitext(os.path.basename(path))[0]
 
 
+def _load_sections(f, sections):
+    """
+    Stream the top-level object and build only the given sections; the
+    others (spf_events is most of the file) are skipped at parse-event
+    level, so they are never materialized.
+    """
+    data = {}
+    events = ijson.parse(f, use_float=True)
+    for prefix, event, value in events:
+        if prefix or event != "map_key" or value not in sections:
+            continue
+        builder, depth = ObjectBuilder(), 0
+        for _, ev, val in events:
+            builder.event(ev, val)
+            if ev in ("start_map", "start_array"):
+                depth += 1
+            elif ev in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                break
+        data[value] = builder.value
+    return data
+
+
 def make_output_dir(tag):
     out = os.path.join(os.path.dirname(__file__), "plots", tag)
     os.makedirs(out, exist_ok=True)
     return out
 
 
+# ── Event arrays ─────────────────────────────────────────────────────────────
+
+def _events_to_soa(events):
+    """Extract convergence event fields once into NumPy arrays (one per field)."""
+    n = len(events)
+    gs = np.array([e["gs_id"] for e in events], dtype=str)
+    # Sorted GS labels, per-event index into them and per-GS counts, shared by all plots
+    gs_ids, gs_idx, gs_counts = np.unique(gs, return_inverse=True, return_counts=True)
+    return {
+        "ts": np.fromiter((e["timestamp"] for e in events), float, n),
+        "cv": np.fromiter((e["convergence_time_s"] for e in events), float, n),
+        "gs": gs,
+        "gs_ids": gs_ids.tolist(),
+        "gs_idx": gs_idx,
+        "gs_counts": gs_counts,
+        "trig": np.array([e.get("trigger", "unknown") for e in events], dtype=str),
+        "adj": np.fromiter((e.get("adjacency_up_time_s", 0) for e in events), float, n),
+        "route": np.fromiter((e.get("route_present_time_s", 0) for e in events), float, n),
+    }
+
+
+def _group_by(keys, values):
+    """Sorted unique keys and the matching groups of values (one sort + split)."""
+    order = np.argsort(keys, kind="stable")
+    labels, counts = np.unique(keys[order], return_counts=True)
+    return labels.tolist(), np.split(values[order], np.cumsum(counts)[:-1])
+
+
+def _lsp_matrix(lsp_measurements):
+    """
+    Stack LSP propagation dicts into P[measurement, node] (NaN = missing or <= 0).
+    Returns (timestamps, node names, P).
+    """
+    node_index = {}
+    for m in lsp_measurements:
+        for node in m["propagation"]:
+            node_index.setdefault(node, len(node_index))
+
+    ts = np.fromiter((m["timestamp"] for m in lsp_measurements), float, len(lsp_measurements))
+    P = np.full((len(lsp_measurements), len(node_index)), np.nan)
+    for t, m in enumerate(lsp_measurements):
+        for node, d in m["propagation"].items():
+            if d > 0:
+                P[t, node_index[node]] = d
+    return ts, np.array(list(node_index), dtype=str), P
+
+
 # ── Plots ────────────────────────────────────────────────────────────────────
 
-def plot_convergence_timeline(events, out):
+_MARKER_PATH = Path.unit_circle().transformed(Affine2D().scale(0.5))
+
+
+def _add_markers(ax, x, y, colors, size, zorder=3):
+    """Circle markers as one PathCollection added directly (skips Axes.scatter's
+    argument parsing and normalization)."""
+    offsets = np.column_stack([x, y])
+    # Same marker geometry as scatter(marker="o"): diameter 1 scaled by sizes (points²)
+    pc = PathCollection([_MARKER_PATH], sizes=[size],
+                        offsets=offsets, offset_transform=ax.transData,
+                        transform=IdentityTransform(),
+                        facecolors=colors, edgecolors="face", zorder=zorder)
+    ax.add_collection(pc, autolim=False)
+    ax.update_datalim(offsets)
+    ax.autoscale_view()
+    return pc
+
+
+def _get_fig(nrows=1, ncols=1, figsize=(8, 5)):
+    """Reuse one cleared figure per layout/size instead of creating one per plot."""
+    return plt.subplots(nrows, ncols, figsize=figsize, clear=True,
+                        num=f"{nrows}x{ncols} {figsize}")
+
+
+def plot_convergence_timeline(soa, out):
     """Convergence time over the simulation timeline, colored by GS."""
-    if not events:
+    if not soa["ts"].size:
         return
-    gs_ids = sorted(set(e["gs_id"] for e in events))
-    colors = plt.cm.tab10(np.linspace(0, 1, max(len(gs_ids), 1)))
-    gs_color = {gs: colors[i] for i, gs in enumerate(gs_ids)}
-
-    fig, ax = plt.subplots(figsize=(14, 5))
-    for e in events:
-        ax.scatter(e["timestamp"], e["convergence_time_s"],
-                   color=gs_color[e["gs_id"]], s=30, zorder=3)
+    gs_ids, gs_idx = soa["gs_ids"], soa["gs_idx"]
+    color_table = plt.cm.tab10(np.linspace(0, 1, max(len(gs_ids), 1)))
+
+    fig, ax = _get_fig(figsize=(14, 5))
+    # one PathCollection for all events
+    _add_markers(ax, soa["ts"], soa["cv"], color_table[gs_idx], 30)
     # legend
-    for gs in gs_ids:
-        ax.scatter([], [], color=gs_color[gs], label=gs, s=30)
+    handles = [Line2D([], [], ls="none", marker="o", color=color_table[i], label=gs)
+               for i, gs in enumerate(gs_ids)]
     ax.set_xlabel("Simulation time (s)")
     ax.set_ylabel("Convergence time (s)")
     ax.set_title("IS-IS Convergence Time per Handover Event")
-    ax.legend(fontsize=7, ncol=2, title="Ground station")
+    ax.legend(handles=handles, fontsize=7, ncol=2, title="Ground station")
     ax.grid(True, alpha=.3)
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "convergence_timeline.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "convergence_timeline.png"), **SAVE_KW)
     print("  -> convergence_timeline.png")
 
 
-def plot_convergence_histogram(events, out):
+def plot_convergence_histogram(soa, out):
     """Distribution of convergence times."""
-    if not events:
+    if not soa["cv"].size:
         return
-    times = [e["convergence_time_s"] for e in events]
-    fig, ax = plt.subplots(figsize=(8, 5))
+    times = soa["cv"]
+    fig, ax = _get_fig(figsize=(8, 5))
     ax.hist(times, bins=25, edgecolor="black", alpha=.75)
     ax.axvline(np.mean(times), color="red", ls="--",
                label=f"Mean = {np.mean(times):.2f} s")
@@ -76,22 +195,20 @@ def plot_convergence_histogram(events, out):
     ax.legend()
     ax.grid(True, alpha=.3)
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "convergence_histogram.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "convergence_histogram.png"), **SAVE_KW)
     print("  -> convergence_histogram.png")
 
 
-def plot_convergence_per_gs(events, out):
+def plot_convergence_per_gs(soa, out):
     """Box plot of convergence time per ground station."""
-    if not events:
+    if not soa["cv"].size:
         return
-    gs_data = defaultdict(list)
-    for e in events:
-        gs_data[e["gs_id"]].append(e["convergence_time_s"])
-    gs_ids = sorted(gs_data.keys())
+    gs_ids = soa["gs_ids"]
+    order = np.argsort(soa["gs_idx"], kind="stable")
+    groups = np.split(soa["cv"][order], np.cumsum(soa["gs_counts"])[:-1])
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    bp = ax.boxplot([gs_data[gs] for gs in gs_ids], tick_labels=gs_ids, patch_artist=True)
+    fig, ax = _get_fig(figsize=(10, 5))
+    bp = ax.boxplot(groups, tick_labels=gs_ids, patch_artist=True)
     colors = plt.cm.tab10(np.linspace(0, 1, len(gs_ids)))
     for patch, c in zip(bp["boxes"], colors):
         patch.set_facecolor(c)
@@ -101,35 +218,28 @@ def plot_convergence_per_gs(events, out):
     ax.set_title("IS-IS Convergence Time by Ground Station")
     ax.grid(True, alpha=.3, axis="y")
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "convergence_per_gs.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "convergence_per_gs.png"), **SAVE_KW)
     print("  -> convergence_per_gs.png")
 
 
-def plot_handover_frequency(events, out):
+def plot_handover_frequency(soa, out):
     """Number of handover events per ground station over time (bar + timeline)."""
-    if not events:
+    if not soa["ts"].size:
         return
-    gs_counts = defaultdict(int)
-    for e in events:
-        gs_counts[e["gs_id"]] += 1
-    gs_ids = sorted(gs_counts.keys())
+    gs_ids, gs_idx = soa["gs_ids"], soa["gs_idx"]
 
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    fig, axes = _get_fig(1, 2, figsize=(14, 5))
 
     # Bar chart: total handovers per GS
     colors = plt.cm.tab10(np.linspace(0, 1, len(gs_ids)))
-    axes[0].bar(gs_ids, [gs_counts[gs] for gs in gs_ids], color=colors)
+    axes[0].bar(gs_ids, soa["gs_counts"], color=colors)
     axes[0].set_xlabel("Ground Station")
     axes[0].set_ylabel("Number of handovers")
     axes[0].set_title("Total Handovers per Ground Station")
     axes[0].grid(True, alpha=.3, axis="y")
 
     # Timeline: event markers
-    gs_color = {gs: colors[i] for i, gs in enumerate(gs_ids)}
-    for i, gs in enumerate(gs_ids):
-        ts = [e["timestamp"] for e in events if e["gs_id"] == gs]
-        axes[1].scatter(ts, [i] * len(ts), color=gs_color[gs], s=20, zorder=3)
+    _add_markers(axes[1], soa["ts"], gs_idx, colors[gs_idx], 20)
     axes[1].set_yticks(range(len(gs_ids)))
     axes[1].set_yticklabels(gs_ids)
     axes[1].set_xlabel("Simulation time (s)")
@@ -137,8 +247,7 @@ def plot_handover_frequency(events, out):
     axes[1].grid(True, alpha=.3)
 
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "handover_frequency.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "handover_frequency.png"), **SAVE_KW)
     print("  -> handover_frequency.png")
 
 
@@ -146,30 +255,22 @@ def plot_lsp_propagation(lsp_measurements, out):
     """LSP propagation delay across satellite nodes over time."""
     if not lsp_measurements:
         return
-    # Collect only satellite nodes (positive propagation values)
-    sat_delays = defaultdict(list)  # node -> list of delays
-    timestamps = []
-    avg_delays = []
+    # Only positive propagation values count (NaN elsewhere)
+    ts, node_names, P = _lsp_matrix(lsp_measurements)
+    measured = ~np.isnan(P)
+    rows = measured.any(axis=1)
+    timestamps = ts[rows]
+    avg_delays = np.nanmean(P[rows], axis=1)
 
-    for m in lsp_measurements:
-        t = m["timestamp"]
-        prop = m["propagation"]
-        delays = [v for v in prop.values() if v > 0]
-        if delays:
-            timestamps.append(t)
-            avg_delays.append(np.mean(delays))
-        for node, d in prop.items():
-            if d > 0:
-                sat_delays[node].append(d)
-
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    fig, axes = _get_fig(1, 2, figsize=(14, 5))
 
     # Average LSP propagation over time
     axes[0].scatter(timestamps, avg_delays, s=8, alpha=0.5)
     if len(timestamps) > 20:
         # rolling average
         window = max(len(timestamps) // 20, 1)
-        rolling = np.convolve(avg_delays, np.ones(window)/window, mode="valid")
+        c = np.cumsum(np.insert(avg_delays, 0, 0))  # prefix sums: O(N) for any window
+        rolling = (c[window:] - c[:-window]) / window
         axes[0].plot(timestamps[window-1:], rolling, color="red", lw=1.5,
                      label=f"Rolling avg (w={window})")
         axes[0].legend()
@@ -179,9 +280,9 @@ def plot_lsp_propagation(lsp_measurements, out):
     axes[0].grid(True, alpha=.3)
 
     # Distribution of per-node max propagation
-    max_per_node = {n: max(ds) for n, ds in sat_delays.items()
-                    if n.startswith("sat")}
-    if max_per_node:
+    cols = np.char.startswith(node_names, "sat") & measured.any(axis=0)
+    if cols.any():
+        max_per_node = dict(zip(node_names[cols].tolist(), np.nanmax(P[:, cols], axis=0)))
         nodes = sorted(max_per_node.keys(), key=lambda x: int(x[3:]))
         vals = [max_per_node[n] for n in nodes]
         axes[1].bar(range(len(nodes)), vals, color="steelblue", alpha=.7)
@@ -192,8 +293,7 @@ def plot_lsp_propagation(lsp_measurements, out):
         axes[1].grid(True, alpha=.3, axis="y")
 
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "lsp_propagation.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "lsp_propagation.png"), **SAVE_KW)
     print("  -> lsp_propagation.png")
 
 
@@ -225,7 +325,7 @@ def plot_lsp_max_all_sats(lsp_measurements, total_sats, out):
     max_val = max(vals) if vals else 0
 
     fig_width = max(12, total_sats * 0.12)
-    fig, ax = plt.subplots(figsize=(fig_width, 6))
+    fig, ax = _get_fig(figsize=(fig_width, 6))
 
     ax.bar(range(total_sats), vals, color=colors, edgecolor="none", width=1.0)
     ax.axhline(mean_polled, color="red", ls="--", lw=1.2,
@@ -254,22 +354,21 @@ def plot_lsp_max_all_sats(lsp_measurements, total_sats, out):
     ax.grid(True, alpha=.3, axis="y")
 
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "lsp_max_all_sats.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "lsp_max_all_sats.png"), **SAVE_KW)
     print("  -> lsp_max_all_sats.png")
 
 
-def plot_adjacency_vs_route(events, out):
+def plot_adjacency_vs_route(soa, out):
     """Compare adjacency up time vs route present time (convergence breakdown)."""
-    if not events:
+    if not soa["adj"].size:
         return
-    adj = [e.get("adjacency_up_time_s", 0) for e in events]
-    route = [e.get("route_present_time_s", 0) for e in events]
-    idx = np.arange(len(events))
+    adj = soa["adj"]
+    route = soa["route"]
+    idx = np.arange(len(adj))
 
-    fig, ax = plt.subplots(figsize=(14, 5))
+    fig, ax = _get_fig(figsize=(14, 5))
     ax.bar(idx, adj, label="Adjacency formation", color="steelblue")
-    ax.bar(idx, [r - a for r, a in zip(route, adj)], bottom=adj,
+    ax.bar(idx, route - adj, bottom=adj,
            label="Route computation", color="coral")
     ax.set_xlabel("Handover event #")
     ax.set_ylabel("Time (s)")
@@ -277,13 +376,30 @@ def plot_adjacency_vs_route(events, out):
     ax.legend()
     ax.grid(True, alpha=.3, axis="y")
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "adjacency_vs_route.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "adjacency_vs_route.png"), **SAVE_KW)
     print("  -> adjacency_vs_route.png")
 
 
+SUMMARY_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>IS-IS Emulation Summary</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; }}
+th {{ background: #4472C4; color: white; }}
+th, td {{ border: 1px solid #999; padding: 4px 12px; text-align: left; }}
+</style></head>
+<body>
+<h3>IS-IS Emulation Summary</h3>
+<table>
+<tr><th>Metric</th><th>Value</th></tr>
+{rows}
+</table>
+</body></html>
+"""
+
+
 def plot_summary_table(summary, out):
-    """Summary metrics as a figure table."""
+    """Summary metrics as a static HTML table."""
     rows = [
         ["Total handovers", str(summary.get("total_handovers", "N/A"))],
         ["Avg convergence", f"{summary.get('avg_convergence_s', 0):.3f} s"],
@@ -297,47 +413,33 @@ def plot_summary_table(summary, out):
         ["Avg LSP propagation", f"{summary.get('avg_lsp_propagation_s', 0):.3f} s"],
         ["Collection duration", f"{summary.get('collection_duration_s', 0):.0f} s"],
     ]
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.axis("off")
-    table = ax.table(cellText=rows, colLabels=["Metric", "Value"],
-                     loc="center", cellLoc="left")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.scale(1.2, 1.5)
-    # header style
-    for j in range(2):
-        table[0, j].set_facecolor("#4472C4")
-        table[0, j].set_text_props(color="white", fontweight="bold")
-    ax.set_title("IS-IS Emulation Summary", fontweight="bold", pad=20)
-    fig.tight_layout()
-    fig.savefig(os.path.join(out, "summary_table.png"), dpi=200)
-    plt.close(fig)
-    print("  -> summary_table.png")
+    # Static HTML: no plot data, so no need for Matplotlib rendering + PNG encoding
+    body = "\n".join(f"<tr><td>{escape(k)}</td><td>{escape(v)}</td></tr>"
+                     for k, v in rows)
+    with open(os.path.join(out, "summary_table.html"), "w") as f:
+        f.write(SUMMARY_HTML.format(rows=body))
+    print("  -> summary_table.html")
 
 
-def plot_connect_vs_handover(events, out):
+def plot_connect_vs_handover(soa, out):
     """Separate convergence stats for 'connect' vs 'handover' triggers."""
-    if not events:
+    if not soa["cv"].size:
         return
-    triggers = defaultdict(list)
-    for e in events:
-        triggers[e.get("trigger", "unknown")].append(e["convergence_time_s"])
+    labels, groups = _group_by(soa["trig"], soa["cv"])
 
-    if len(triggers) < 2:
+    if len(labels) < 2:
         # Only one trigger type, skip
         return
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    labels = sorted(triggers.keys())
-    bp = ax.boxplot([triggers[t] for t in labels], tick_labels=labels, patch_artist=True)
+    fig, ax = _get_fig(figsize=(8, 5))
+    bp = ax.boxplot(groups, tick_labels=labels, patch_artist=True)
     colors = ["#4472C4", "#ED7D31", "#70AD47", "#FFC000"]
     for patch, c in zip(bp["boxes"], colors):
         patch.set_facecolor(c)
         patch.set_alpha(0.6)
-    for t in labels:
-        vals = triggers[t]
+    for i, vals in enumerate(groups):
         ax.annotate(f"n={len(vals)}\nμ={np.mean(vals):.2f}s",
-                    xy=(labels.index(t) + 1, np.median(vals)),
+                    xy=(i + 1, np.median(vals)),
                     xytext=(10, 20), textcoords="offset points",
                     fontsize=8, ha="left",
                     arrowprops=dict(arrowstyle="->", color="gray"))
@@ -346,8 +448,7 @@ def plot_connect_vs_handover(events, out):
     ax.set_title("Convergence Time by Trigger Type (connect vs handover)")
     ax.grid(True, alpha=.3, axis="y")
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "connect_vs_handover.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "connect_vs_handover.png"), **SAVE_KW)
     print("  -> connect_vs_handover.png")
 
 
@@ -377,7 +478,7 @@ def plot_all_links_utilization(link_data, out):
     mean_val = np.mean(avg_vals)
     median_val = np.median(avg_vals)
 
-    fig, ax = plt.subplots(figsize=(max(10, len(sat_ids) * 0.8), 5))
+    fig, ax = _get_fig(figsize=(max(10, len(sat_ids) * 0.8), 5))
     bars = ax.bar(range(len(sat_ids)), avg_vals, color="#70AD47", edgecolor="none",
                   alpha=0.85)
     ax.axhline(mean_val, color="red", ls="--", lw=1.2,
@@ -396,8 +497,7 @@ def plot_all_links_utilization(link_data, out):
     ax.legend(fontsize=8)
     ax.grid(True, alpha=.3, axis="y")
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "all_links_utilization.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "all_links_utilization.png"), **SAVE_KW)
     print("  -> all_links_utilization.png")
 
 
@@ -422,7 +522,7 @@ def plot_sat_total_load(link_data, out):
     mean_load = np.mean(loads)
     median_load = np.median(loads)
 
-    fig, ax = plt.subplots(figsize=(16, 6))
+    fig, ax = _get_fig(figsize=(16, 6))
     p90 = np.percentile(loads, 90)
     bar_colors = ["#ED7D31" if l >= p90 else "#4472C4" for l in loads]
     ax.bar(range(len(sat_ids)), loads, color=bar_colors, edgecolor="none")
@@ -444,8 +544,7 @@ def plot_sat_total_load(link_data, out):
               fontsize=8, ncol=2)
     ax.grid(True, alpha=.3, axis="y")
     fig.tight_layout()
-    fig.savefig(os.path.join(out, "sat_total_load.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "sat_total_load.png"), **SAVE_KW)
     print("  -> sat_total_load.png")
 
 
@@ -473,7 +572,7 @@ def plot_top_bottom_links(link_data, out):
     # Find the link closest to median
     median_link = min(avg_per_link.items(), key=lambda x: abs(x[1] - global_median))
 
-    fig, axes = plt.subplots(1, 2, figsize=(18, 7))
+    fig, axes = _get_fig(1, 2, figsize=(18, 7))
 
     # Left: Top 5 over time
     colors_top = plt.cm.Reds(np.linspace(0.4, 0.9, 5))
@@ -516,8 +615,7 @@ def plot_top_bottom_links(link_data, out):
     fig.suptitle(f"Link Utilization Extremes  |  Global mean={global_mean:.4f}%  "
                  f"median={global_median:.4f}%", fontsize=11, fontweight="bold")
     fig.tight_layout(rect=[0, 0, 1, 0.95])
-    fig.savefig(os.path.join(out, "top_bottom_links.png"), dpi=200)
-    plt.close(fig)
+    fig.savefig(os.path.join(out, "top_bottom_links.png"), **SAVE_KW)
     print("  -> top_bottom_links.png")
 
 
@@ -623,19 +721,35 @@ def main():
                     max_idx = max(max_idx, int(node[3:]))
         total_sats = max_idx + 1
 
-    plot_summary_table(summary, out)
-    plot_convergence_timeline(convergence, out)
-    plot_convergence_histogram(convergence, out)
-    plot_convergence_per_gs(convergence, out)
-    plot_handover_frequency(convergence, out)
-    plot_adjacency_vs_route(convergence, out)
-    plot_connect_vs_handover(convergence, out)
-    plot_lsp_propagation(lsp, out)
-    plot_lsp_max_all_sats(lsp, total_sats, out)
-    plot_all_links_utilization(link_util, out)
-    plot_sat_total_load(link_util, out)
-    plot_top_bottom_links(link_util, out)
-
+    # Extract convergence event fields once, shared by all event plots
+    soa = _events_to_soa(convergence)
+
+    tasks = [
+        (plot_summary_table, summary, out),
+        (plot_convergence_timeline, soa, out),
+        (plot_convergence_histogram, soa, out),
+        (plot_convergence_per_gs, soa, out),
+        (plot_handover_frequency, soa, out),
+        (plot_adjacency_vs_route, soa, out),
+        (plot_connect_vs_handover, soa, out),
+        (plot_lsp_propagation, lsp, out),
+        (plot_lsp_max_all_sats, lsp, total_sats, out),
+        (plot_all_links_utilization, link_util, out),
+        (plot_sat_total_load, link_util, out),
+        (plot_top_bottom_links, link_util, out),
+    ]
+    # Plots are independent and CPU-bound (PNG encoding): spread over processes
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(fn, *args) for fn, *args in tasks]
+            for f in futures:
+                f.result()  # re-raise any plotting error
+    else:
+        for fn, *args in tasks:
+            fn(*args)
+
+    plt.close("all")
     print(f"\nDone! {len(os.listdir(out))} plots saved to {out}/")
 
 
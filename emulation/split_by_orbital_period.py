@@ -4,7 +4,9 @@ Split a Mininet ISL+GS timeseries JSON (terrestrial period) into
 one JSON file per orbital period.
 
 Usage:
-    python3 split_by_orbital_period.py <input.json> [output_dir]
+    python3 split_by_orbital_period.py <input.json> [output_dir] [--indent]
+
+Output files are compact JSON (machine-consumed); --indent pretty-prints them.
 
 Output:
     output_dir/orbital_period_01.json
@@ -20,11 +22,64 @@ Each output file is a self-contained Mininet JSON with:
   - topology unchanged
 """
 
-import copy
 import json
 import math
+import mmap
+import multiprocessing
 import os
 import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+
+try:
+    import orjson  # C parser/serializer, much faster on multi-GB timeseries
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """
+    Parse a JSON file (orjson if available, stdlib json otherwise).
+    orjson parses straight from a read-only mmap of the file, so the input
+    is never copied into a bytes object first.
+    """
+    with open(path, "rb") as f:
+        # mmap rejects empty files: parse those as bytes (same decode error)
+        if not orjson or os.fstat(f.fileno()).st_size == 0:
+            return (orjson or json).loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def write_json(path, obj, indent=False):
+    """
+    Write obj as JSON followed by a newline (orjson if available, stdlib json
+    otherwise). Compact by default; indent=True pretty-prints with 2 spaces.
+    """
+    if orjson:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+        data = memoryview(orjson.dumps(obj, option=option))
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            # Written once, never re-read here: hint the kernel to drop it
+            # from the page cache (pages still dirty are left to writeback)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    else:
+        with open(path, "w", buffering=1 << 20) as f:
+            if indent:
+                json.dump(obj, f, indent=2)
+            else:
+                json.dump(obj, f, separators=(",", ":"))
+            f.write("\n")
 
 
 def get_orbital_period_s(data):
@@ -34,172 +89,260 @@ def get_orbital_period_s(data):
 
 
 def get_actual_duration(data):
-    """Find the actual max timestamp across all data."""
-    max_t = 0
+    """Find the actual max timestamp across all data (single max() over all timestamps)."""
+    gs_links = data.get("gsLinks", {})
+    return max(chain(
+        (0,),
+        (s["timestamp"] for link in data.get("islLinks", []) for s in link.get("timeSeries", [])),
+        (event["t"] for event in gs_links.get("events", [])),
+        (s["t"] for entry in gs_links.get("timeline", []) for s in entry.get("samples", [])),
+    ))
+
+
+def period_bounds(orbital_period_s, actual_duration, sampling_interval):
+    """[(t_start, t_end)] of each orbital period window [t_start, t_end)."""
+    num_periods = math.ceil(actual_duration / orbital_period_s)
+    return [
+        (i * orbital_period_s,
+         min((i + 1) * orbital_period_s, actual_duration + sampling_interval))
+        for i in range(num_periods)
+    ]
 
-    for link in data.get("islLinks", []):
-        for sample in link.get("timeSeries", []):
-            max_t = max(max_t, sample["timestamp"])
 
-    for event in data.get("gsLinks", {}).get("events", []):
-        max_t = max(max_t, event["t"])
+def _period_of(t, starts, bounds):
+    """Index of the period window containing t, or None if outside all windows."""
+    i = bisect_right(starts, t) - 1
+    if i < 0 or t >= bounds[i][1]:
+        return None
+    return i
 
-    for entry in data.get("gsLinks", {}).get("timeline", []):
-        for sample in entry.get("samples", []):
-            max_t = max(max_t, sample["t"])
 
-    return max_t
+def _value_column(values):
+    """
+    Column for a sample field, emitted back unchanged by .tolist(): int64 or
+    float64 when purely numeric, object array otherwise (None, missing,
+    strings... passed through as-is).
+    """
+    col = np.array(values)
+    if col.dtype.kind not in "iuf" or col.ndim != 1:
+        col = np.empty(len(values), dtype=object)
+        col[:] = values
+    return col
 
 
-def split_isl_links(isl_links, t_start, t_end, sampling_interval):
+def _series_by_period(samples, fields, edges):
     """
-    Filter ISL timeSeries to samples within [t_start, t_end)
-    and shift timestamps so the period starts at sampling_interval.
+    Split a time series into per-period columns (Structure of Arrays).
+    fields[0] is the timestamp, read into a float64 array; the other fields
+    are read once each with _value_column. Samples are assigned to windows
+    with one searchsorted over the period starts, input order being kept
+    within a period.
+    Returns {period index: [column arrays]}.
     """
-    result = []
+    n = len(samples)
+    if not n:
+        return {}
+    ts = np.fromiter((s[fields[0]] for s in samples), float, n)
+    cols = [ts] + [_value_column([s.get(f) for s in samples]) for f in fields[1:]]
+    starts, ends = edges
+
+    idx = np.searchsorted(starts, ts, side="right") - 1
+    inside = idx >= 0
+    inside[inside] = ts[inside] < ends[idx[inside]]
+    idx[~inside] = -1
+
+    order = np.argsort(idx, kind="stable")
+    periods, first = np.unique(idx[order], return_index=True)
+    return {
+        i: [c[positions] for c in cols]
+        for i, positions in zip(periods.tolist(), np.split(order, first[1:]))
+        if i >= 0
+    }
+
+
+def _shift(ts, t_start):
+    """Timestamps relative to the period start, rounded in one vectorized pass."""
+    shifted = ts - t_start
+    np.round(shifted, 6, out=shifted)
+    return shifted.tolist()
+
+
+def _edges(bounds):
+    """(starts, ends) of the period windows as arrays, for searchsorted."""
+    return (np.array([b[0] for b in bounds], dtype=float),
+            np.array([b[1] for b in bounds], dtype=float))
+
+
+def bucket_isl_links(isl_links, bounds):
+    """
+    Single pass over all ISL samples: dispatch each one to its period and
+    shift its timestamp so the period starts at 0.
+    Returns one list of links per period (only links with samples in it).
+    """
+    edges = _edges(bounds)
+    buckets = [[] for _ in bounds]
     for link in isl_links:
-        new_link = {
+        per_period = _series_by_period(link.get("timeSeries", []),
+                                       ("timestamp", "distance_km", "latency_ms"), edges)
+        # Link fields are the same in every period: build them once
+        header = {
             "satA": link["satA"],
             "satB": link["satB"],
             "type": link.get("type", "unknown"),
             "bandwidth_mbps": link.get("bandwidth_mbps", 1000),
         }
+        for i, (ts, dist, lat) in per_period.items():
+            t_start = bounds[i][0]
+            # Back to dicts only when emitting (output schema unchanged)
+            new_ts = [
+                {"timestamp": t, "distance_km": d, "latency_ms": l}
+                for t, d, l in zip(_shift(ts, t_start), dist.tolist(), lat.tolist())
+            ]
+            buckets[i].append(dict(header, timeSeries=new_ts))
 
-        new_ts = []
-        for sample in link.get("timeSeries", []):
-            t = sample["timestamp"]
-            if t_start <= t < t_end:
-                new_ts.append({
-                    "timestamp": round(t - t_start, 6),
-                    "distance_km": sample["distance_km"],
-                    "latency_ms": sample["latency_ms"],
-                })
-
-        new_link["timeSeries"] = new_ts
-        # Only include links that have samples in this period
-        if new_ts:
-            result.append(new_link)
+    return buckets
 
-    return result
 
-
-def split_gs_events(events, t_start, t_end):
+def bucket_gs_events(events, bounds):
     """
-    Filter GS events to those within [t_start, t_end) and shift timestamps.
-    For the first period slice, we also need to reconstruct initial connect
-    events for GS that were already connected at t_start.
+    Single pass over GS events: dispatch each one to its period
+    and shift its timestamp.
     """
-    result = []
+    starts = [b[0] for b in bounds]
+    buckets = [[] for _ in bounds]
     for event in events:
         t = event["t"]
-        if t_start <= t < t_end:
-            new_event = dict(event)
-            new_event["t"] = round(t - t_start, 6)
-            result.append(new_event)
+        i = _period_of(t, starts, bounds)
+        if i is None:
+            continue
+        new_event = dict(event)
+        new_event["t"] = round(t - starts[i], 6)
+        buckets[i].append(new_event)
 
-    return result
+    return buckets
 
 
-def find_active_gs_at_time(events, t_target):
+def _apply_gs_event(active, event):
+    """Update {gs_id: {"satId", "latency_ms"}} with one connect/handover/disconnect."""
+    action = event["action"]
+    gs_id = event["gsId"]
+    if action == "connect":
+        active[gs_id] = {
+            "satId": event["satId"],
+            "latency_ms": event.get("latency_ms", 5.0),
+        }
+    elif action == "disconnect":
+        active.pop(gs_id, None)
+    elif action == "handover":
+        active[gs_id] = {
+            "satId": event["toSatId"],
+            "latency_ms": event.get("latency_ms", 5.0),
+        }
+
+
+def active_gs_at_period_starts(events, bounds):
     """
-    Replay events up to t_target to determine which GS are connected
-    and to which satellite at that moment.
-    Returns {gs_id: {"satId": int, "latency_ms": float}}
+    Which GS are connected, and to which satellite, at the start of each
+    period. Events are sorted once and replayed in a single forward sweep,
+    snapshotting the state at each period boundary.
+    Returns [{gs_id: {"satId": int, "latency_ms": float}}] indexed by period.
     """
+    ordered = sorted(events, key=lambda e: e["t"])
     active = {}
-    for event in sorted(events, key=lambda e: e["t"]):
-        if event["t"] >= t_target:
-            break
-        action = event["action"]
-        gs_id = event["gsId"]
-        if action == "connect":
-            active[gs_id] = {
-                "satId": event["satId"],
-                "latency_ms": event.get("latency_ms", 5.0),
-            }
-        elif action == "disconnect":
-            active.pop(gs_id, None)
-        elif action == "handover":
-            active[gs_id] = {
-                "satId": event["toSatId"],
-                "latency_ms": event.get("latency_ms", 5.0),
-            }
-    return active
-
-
-def split_gs_events_with_initial_state(all_events, t_start, t_end):
+    snapshots = []
+    j = 0
+    for t_start, _ in bounds:
+        while j < len(ordered) and ordered[j]["t"] < t_start:
+            _apply_gs_event(active, ordered[j])
+            j += 1
+        snapshots.append(dict(active))
+    return snapshots
+
+
+def initial_connect_events(active):
     """
-    Build the event list for a period [t_start, t_end).
-    Injects synthetic 'connect' events at t=0 for GS that were already
-    connected at t_start (from previous periods).
+    Synthetic 'connect' events at t=0 for GS already connected at the
+    start of a period (from previous periods).
     """
-    # Find what's connected at t_start
-    active_at_start = find_active_gs_at_time(all_events, t_start)
-
-    # Synthetic connect events at t=0
-    initial_events = []
-    for gs_id, info in sorted(active_at_start.items()):
-        initial_events.append({
+    return [
+        {
             "t": 0,
             "gsId": gs_id,
             "action": "connect",
             "satId": info["satId"],
             "latency_ms": info["latency_ms"],
-        })
-
-    # Actual events in this window
-    period_events = split_gs_events(all_events, t_start, t_end)
-
-    return initial_events + period_events
+        }
+        for gs_id, info in sorted(active.items())
+    ]
 
 
-def split_gs_timeline(timeline, t_start, t_end):
+def bucket_gs_timeline(timeline, bounds):
     """
-    Filter and trim GS timeline entries to [t_start, t_end).
-    Shift timestamps so the period starts at 0.
+    Single pass over GS timeline samples: trim each entry to every period
+    it overlaps and shift timestamps so the period starts at 0.
     """
-    result = []
+    edges = _edges(bounds)
+    buckets = [[] for _ in bounds]
     for entry in timeline:
         entry_start = entry.get("startTime") or 0
         entry_end = entry.get("endTime")
         if entry_end is None:
             entry_end = float("inf")
 
-        # Check if this entry overlaps with our window
-        if entry_end <= t_start or entry_start >= t_end:
-            continue
+        per_period = _series_by_period(entry.get("samples", []), ("t", "latency_ms"), edges)
+        for i, (ts, lat) in per_period.items():
+            t_start, t_end = bounds[i]
+            # Only entries overlapping the window
+            if entry_end <= t_start or entry_start >= t_end:
+                continue
+            new_samples = [
+                {"t": t, "latency_ms": l}
+                for t, l in zip(_shift(ts, t_start), lat.tolist())
+            ]
+            buckets[i].append({
+                "gsId": entry["gsId"],
+                "satId": entry["satId"],
+                "startTime": round(max(entry_start, t_start) - t_start, 6),
+                "endTime": round(min(entry_end, t_end) - t_start, 6),
+                "samples": new_samples,
+            })
+
+    return buckets
+
+
+def bucketize(data, bounds):
+    """
+    Split ISL links, GS events and GS timeline into per-period buckets
+    in one pass each (instead of one full scan per period).
+    Returns [{"islLinks", "events", "timeline"}] indexed by period.
+    """
+    gs_links = data.get("gsLinks", {})
+    all_events = gs_links.get("events", [])
 
-        # Filter samples within window
-        new_samples = []
-        for sample in entry.get("samples", []):
-            t = sample["t"]
-            if t_start <= t < t_end:
-                new_samples.append({
-                    "t": round(t - t_start, 6),
-                    "latency_ms": sample["latency_ms"],
-                })
-
-        if not new_samples:
-            continue
+    isl_buckets = bucket_isl_links(data.get("islLinks", []), bounds)
+    event_buckets = bucket_gs_events(all_events, bounds)
+    timeline_buckets = bucket_gs_timeline(gs_links.get("timeline", []), bounds)
 
-        new_entry = {
-            "gsId": entry["gsId"],
-            "satId": entry["satId"],
-            "startTime": round(max(entry_start, t_start) - t_start, 6),
-            "endTime": round(min(entry_end, t_end) - t_start, 6),
-            "samples": new_samples,
-        }
-        result.append(new_entry)
+    active_at_start = active_gs_at_period_starts(all_events, bounds)
 
-    return result
+    return [
+        {
+            "islLinks": isl_buckets[i],
+            "events": initial_connect_events(active_at_start[i]) + event_buckets[i],
+            "timeline": timeline_buckets[i],
+        }
+        for i in range(len(bounds))
+    ]
 
 
-def build_period_json(data, period_index, t_start, t_end, orbital_period_s, sampling_interval):
-    """Build a complete JSON for one orbital period."""
+def build_period_json(data, period_index, t_start, t_end, bucket):
+    """Build a complete JSON for one orbital period from its bucket."""
     out = {}
 
     # Metadata
-    meta = copy.deepcopy(data["metadata"])
+    # Shallow copies: only the simulation sub-dict and top-level keys change
+    meta = dict(data["metadata"])
+    meta["simulation"] = dict(meta["simulation"])
     meta["simulation"]["numPeriods"] = 1
     meta["simulation"]["duration_s"] = round(t_end - t_start, 6)
     meta["orbitalPeriodIndex"] = period_index
@@ -213,40 +356,78 @@ def build_period_json(data, period_index, t_start, t_end, orbital_period_s, samp
     out["topology"] = data["topology"]
 
     # ISL links
-    out["islLinks"] = split_isl_links(
-        data.get("islLinks", []), t_start, t_end, sampling_interval
-    )
+    out["islLinks"] = bucket["islLinks"]
 
     # GS links
-    all_events = data.get("gsLinks", {}).get("events", [])
-    all_timeline = data.get("gsLinks", {}).get("timeline", [])
-
     out["gsLinks"] = {
-        "events": split_gs_events_with_initial_state(all_events, t_start, t_end),
-        "timeline": split_gs_timeline(all_timeline, t_start, t_end),
+        "events": bucket["events"],
+        "timeline": bucket["timeline"],
     }
 
     return out
 
 
+def write_period(data, period_index, t_start, t_end, bucket, output_dir, num_periods,
+                 indent=False):
+    """Build and write one period file. Returns its progress line."""
+    period_data = build_period_json(data, period_index, t_start, t_end, bucket)
+
+    # Stats
+    n_isl = len(period_data["islLinks"])
+    n_isl_samples = sum(
+        len(link["timeSeries"]) for link in period_data["islLinks"]
+    )
+    n_events = len(period_data["gsLinks"]["events"])
+    n_timeline = len(period_data["gsLinks"]["timeline"])
+
+    filename = f"orbital_period_{period_index+1:02d}.json"
+    filepath = os.path.join(output_dir, filename)
+
+    write_json(filepath, period_data, indent)
+
+    size_mb = os.path.getsize(filepath) / (1024 * 1024)
+    return (
+        f"  [{period_index+1:2d}/{num_periods}] {filename} "
+        f"t=[{t_start:.0f}s, {t_end:.0f}s] "
+        f"ISL={n_isl} ({n_isl_samples} samples) "
+        f"GS events={n_events} timeline={n_timeline} "
+        f"({size_mb:.1f} MB)"
+    )
+
+
+# Work shared with forked writer processes: (base, bounds, buckets, output_dir,
+# num_periods, indent). Inherited copy-on-write, so buckets are never pickled.
+_shared = None
+
+
+def _write_shared_period(i):
+    """Write period i from the inherited _shared state. Returns its progress line."""
+    base, bounds, buckets, output_dir, num_periods, indent = _shared
+    t_start, t_end = bounds[i]
+    return write_period(base, i, t_start, t_end, buckets[i], output_dir, num_periods, indent)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input.json> [output_dir]")
+    global _shared
+    indent = "--indent" in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != "--indent"]
+    if len(args) < 1:
+        print(f"Usage: {sys.argv[0]} <input.json> [output_dir] [--indent]")
         print(f"Example: python3 {sys.argv[0]} mininet_isl_gs_timeseries_2026-02-16.json")
         sys.exit(1)
 
-    input_file = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) >= 3 else "orbital_periods"
+    input_file = args[0]
+    output_dir = args[1] if len(args) >= 2 else "orbital_periods"
 
     # Load data
     print(f"Loading {input_file}...")
-    with open(input_file) as f:
-        data = json.load(f)
+    data = load_json(input_file)
 
     orbital_period_s = get_orbital_period_s(data)
     actual_duration = get_actual_duration(data)
     sampling_interval = data["metadata"]["simulation"].get("samplingInterval_s", 20)
-    num_periods = math.ceil(actual_duration / orbital_period_s)
+    bounds = period_bounds(orbital_period_s, actual_duration, sampling_interval)
+    num_periods = len(bounds)
 
     print(f"Orbital period: {orbital_period_s:.1f}s ({orbital_period_s/60:.1f} min)")
     print(f"Actual data duration: {actual_duration:.0f}s ({actual_duration/3600:.1f}h)")
@@ -256,37 +437,23 @@ def main():
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
-    # Split
-    for i in range(num_periods):
-        t_start = i * orbital_period_s
-        t_end = min((i + 1) * orbital_period_s, actual_duration + sampling_interval)
-
-        period_data = build_period_json(
-            data, i, t_start, t_end, orbital_period_s, sampling_interval
-        )
-
-        # Stats
-        n_isl = len(period_data["islLinks"])
-        n_isl_samples = sum(
-            len(link["timeSeries"]) for link in period_data["islLinks"]
-        )
-        n_events = len(period_data["gsLinks"]["events"])
-        n_timeline = len(period_data["gsLinks"]["timeline"])
-
-        filename = f"orbital_period_{i+1:02d}.json"
-        filepath = os.path.join(output_dir, filename)
-
-        with open(filepath, "w") as f:
-            json.dump(period_data, f, indent=2)
-
-        size_mb = os.path.getsize(filepath) / (1024 * 1024)
-        print(
-            f"  [{i+1:2d}/{num_periods}] {filename} "
-            f"t=[{t_start:.0f}s, {t_end:.0f}s] "
-            f"ISL={n_isl} ({n_isl_samples} samples) "
-            f"GS events={n_events} timeline={n_timeline} "
-            f"({size_mb:.1f} MB)"
-        )
+    # Split: one pass to bucket every sample/event by period
+    buckets = bucketize(data, bounds)
+
+    # Periods are independent: serialize + write them in parallel. Workers
+    # are forked after bucketing and inherit the buckets; only the period
+    # index goes through IPC (pickling a bucket costs as much as dumping it)
+    base = {"metadata": data["metadata"], "topology": data["topology"]}
+    _shared = (base, bounds, buckets, output_dir, num_periods, indent)
+    workers = min(num_periods, os.cpu_count() or 1)
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            for line in executor.map(_write_shared_period, range(num_periods)):
+                print(line)
+    else:
+        for i in range(num_periods):
+            print(_write_shared_period(i))
 
     print(f"\nDone. {num_periods} files written to {output_dir}/")
 
@@ -5,10 +5,14 @@ Importe directement les modules sources via emulation_utils.py et generate_test_
 Aucune dépendance Mininet requise.
 """
 
+import importlib
+import json
 import math
 import sys
+import types
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 EMULATION_DIR = Path(__file__).parent.parent.parent / "emulation"
@@ -21,7 +25,16 @@ from emulation_utils import (
     compute_packet_loss,
     compute_isl_subnet,
     compute_gs_subnet,
+    format_delay,
+    netem_change_args,
+    netem_change_template,
+    shared_sample_grid,
+    compute_latency_updates,
+    closest_sample_index,
+    compute_next_hops,
 )
+import emulation_utils
+import split_by_orbital_period
 
 
 # ── Test 1 : make_latency_timeseries ─────────────────────────────────────────
@@ -197,3 +210,364 @@ class TestIPAllocation:
     def test_isl_subnets_unique(self):
         subnets = [compute_isl_subnet(i) for i in range(12)]
         assert len(subnets) == len(set(subnets)), "Sous-réseaux ISL dupliqués"
+
+
+# ── Test 7 : Formatage des délais netem ──────────────────────────────────────
+
+class TestFormatDelay:
+    """Tests de format_delay depuis emulation_utils.py."""
+
+    def test_three_decimals(self):
+        assert format_delay(3.4123) == "3.412ms"
+
+    def test_integer_latency(self):
+        assert format_delay(8) == "8.000ms"
+
+    def test_matches_tclink_format(self):
+        """Même format que f'{lat:.3f}ms' utilisé pour TCLink(delay=...)."""
+        for lat in [0.5, 2.2, 9.9999]:
+            assert format_delay(lat) == f"{lat:.3f}ms"
+
+
+class TestNetemChangeArgs:
+    """Tests de netem_change_args depuis emulation_utils.py."""
+
+    def test_in_place_change_on_mininet_handle(self):
+        args = netem_change_args("sat0-eth1", "3.412ms", 1000)
+        assert args == "qdisc change dev sat0-eth1 parent 5:1 handle 10: netem delay 3.412ms limit 1000"
+
+    def test_never_deletes_or_adds(self):
+        args = netem_change_args("gs0-eth0", "5.000ms", 500)
+        assert args.startswith("qdisc change ")
+        assert " del " not in args and " add " not in args
+
+    def test_limit_preserved(self):
+        assert netem_change_args("sat1-eth0", "1.000ms", 500).endswith("limit 500")
+
+    def test_template_matches_args(self):
+        template = netem_change_template("sat0-eth1", 1000)
+        assert template % "3.412ms" == netem_change_args("sat0-eth1", "3.412ms", 1000)
+
+
+# ── Test 8 : Grille temporelle commune et sélection des mises à jour ISL ────
+
+class TestSampleGrid:
+    """Tests de shared_sample_grid et compute_latency_updates depuis emulation_utils.py.
+    La grille commune n'existe que si tous les liens ont exactement les mêmes timestamps."""
+
+    def test_uniform_sampling(self):
+        grid = shared_sample_grid([[0, 20, 40], [0, 20, 40]])
+        assert grid.tolist() == [0, 20, 40]
+
+    def test_irregular_sampling_has_no_grid(self):
+        assert shared_sample_grid([[0, 100], [0, 45, 100]]) is None
+
+    def test_jitter_has_no_grid(self):
+        assert shared_sample_grid([[0, 20, 40], [0, 20.000001, 40]]) is None
+
+    def test_empty(self):
+        assert len(shared_sample_grid([])) == 0
+
+    def test_all_links_on_first_call(self):
+        links = compute_latency_updates(np.array([3.0, 8.0]), np.full(2, np.inf))
+        assert links.tolist() == [0, 1]
+
+    def test_unchanged_links_skipped(self):
+        links = compute_latency_updates(np.array([3.5, 9.0, 5.0]), np.array([3.5, 8.0, 5.0005]))
+        assert links.tolist() == [1]
+
+
+class TestISLSampleLookup:
+    """DynamicLatencyUpdater._isl_sample à des temps hors grille : doit reproduire
+    min(timeseries, key=|t - current_time|) lien par lien, grille commune ou non."""
+
+    @staticmethod
+    def _updater(module, series):
+        isl_links = [
+            {"satA": i, "satB": i + 1, "timeSeries": [
+                {"timestamp": t, "latency_ms": float(t)} for t in ts]}
+            for i, ts in enumerate(series)
+        ]
+        return module.DynamicLatencyUpdater(None, isl_links, {}, None)
+
+    def _check(self, updater, series, times):
+        for t in times:
+            updater.current_time = t
+            latencies, delays = updater._isl_sample()
+            expected = [min(ts, key=lambda s: abs(s - t)) for ts in series]
+            assert latencies.tolist() == expected, f"t={t}"
+            assert list(delays) == [format_delay(x) for x in expected]
+
+    def test_irregular_sampling(self, mininet_gs_timeseries):
+        series = [[0, 100], [0, 45, 100]]
+        updater = self._updater(mininet_gs_timeseries, series)
+        assert updater.isl_grid is None
+        self._check(updater, series, [0, 30, 60, 72.5, 99, 100, 130])
+
+    def test_shared_grid_off_grid_times(self, mininet_gs_timeseries):
+        series = [[0, 20, 40], [0, 20, 40]]
+        updater = self._updater(mininet_gs_timeseries, series)
+        assert updater.isl_grid is not None
+        self._check(updater, series, [0, 9, 10, 11, 27, 33, 40, 55])
+
+
+# ── Test 9 : Recherche dichotomique d'échantillon ────────────────────────────
+
+class TestClosestSampleIndex:
+    """Tests de closest_sample_index depuis emulation_utils.py."""
+
+    TS = [0, 20, 40, 60]
+
+    def test_exact_match(self):
+        assert closest_sample_index(self.TS, 40) == 2
+
+    def test_between_samples(self):
+        assert closest_sample_index(self.TS, 27) == 1
+        assert closest_sample_index(self.TS, 33) == 2
+
+    def test_tie_keeps_first(self):
+        """Même comportement que min() : le premier échantillon à égalité."""
+        assert closest_sample_index(self.TS, 30) == 1
+
+    def test_out_of_range_clamped(self):
+        assert closest_sample_index(self.TS, -10) == 0
+        assert closest_sample_index(self.TS, 1000) == 3
+
+    def test_empty_series(self):
+        assert closest_sample_index([], 10) is None
+
+    def test_hint_matches_full_search(self):
+        idx = 0
+        for t in range(0, 80, 7):
+            idx = closest_sample_index(self.TS, t, idx)
+            assert idx == closest_sample_index(self.TS, t)
+
+    def test_stale_hint_after_time_reset(self):
+        assert closest_sample_index(self.TS, 0, lo=3) == 0
+
+
+# ── Test 10 : Table de prochains sauts (routage statique) ────────────────────
+
+def _isl(a, b, latency):
+    return {"satA": a, "satB": b, "timeSeries": [{"timestamp": 0, "latency_ms": latency}]}
+
+
+class TestComputeNextHops:
+    """Tests de compute_next_hops depuis emulation_utils.py (chemins les plus courts uniques).
+    Anneau 0-1-2-3-0 où le lien 3-0 est très lent : 0→3 passe par 1 et 2."""
+
+    LINKS = [_isl(0, 1, 1.0), _isl(1, 2, 1.0), _isl(2, 3, 1.0), _isl(3, 0, 10.0)]
+    EXPECTED = {
+        "sat0": {"sat1": "sat1", "sat2": "sat1", "sat3": "sat1"},
+        "sat1": {"sat0": "sat0", "sat2": "sat2", "sat3": "sat2"},
+        "sat2": {"sat0": "sat1", "sat1": "sat1", "sat3": "sat3"},
+        "sat3": {"sat0": "sat2", "sat1": "sat2", "sat2": "sat2"},
+    }
+
+    def test_next_hops(self):
+        assert compute_next_hops(self.LINKS) == self.EXPECTED
+
+    def test_heapq_fallback_matches(self, monkeypatch):
+        monkeypatch.setattr(emulation_utils, "csgraph_dijkstra", None)
+        emulation_utils._next_hops_cached.cache_clear()
+        try:
+            assert compute_next_hops(self.LINKS) == self.EXPECTED
+        finally:
+            emulation_utils._next_hops_cached.cache_clear()
+
+    def test_process_pool_fallback_matches(self, monkeypatch):
+        monkeypatch.setattr(emulation_utils, "csgraph_dijkstra", None)
+        monkeypatch.setattr(emulation_utils, "PARALLEL_MIN_NODES", 0)
+        monkeypatch.setattr(emulation_utils.os, "cpu_count", lambda: 2)
+        emulation_utils._next_hops_cached.cache_clear()
+        try:
+            assert compute_next_hops(self.LINKS) == self.EXPECTED
+        finally:
+            emulation_utils._next_hops_cached.cache_clear()
+
+    def test_same_topology_is_cached(self):
+        first = compute_next_hops(self.LINKS)
+        assert compute_next_hops([dict(link) for link in self.LINKS]) is first
+
+    def test_changed_latency_recomputed(self):
+        links = self.LINKS[:3] + [_isl(3, 0, 0.5)]
+        assert compute_next_hops(links)["sat0"]["sat3"] == "sat3"
+
+    def test_parallel_links_keep_shortest(self):
+        links = self.LINKS + [_isl(0, 3, 0.5)]
+        assert compute_next_hops(links)["sat0"]["sat3"] == "sat3"
+
+    def test_unreachable_not_routed(self):
+        links = [_isl(0, 1, 1.0), _isl(2, 3, 1.0)]
+        routes = compute_next_hops(links)
+        assert "sat2" not in routes["sat0"]
+        assert routes["sat0"] == {"sat1": "sat1"}
+
+    def test_missing_timeseries_uses_default(self):
+        links = [{"satA": 0, "satB": 1}]
+        assert compute_next_hops(links) == {"sat0": {"sat1": "sat1"}, "sat1": {"sat0": "sat0"}}
+
+
+# ── Test 11 : Découpage par période orbitale ─────────────────────────────────
+
+class TestSplitByOrbitalPeriod:
+    """Tests du découpage en un passage (bucketize) de split_by_orbital_period.py.
+    Fenêtres de 100 s sur 250 s de données : [0,100), [100,200), [200,270)."""
+
+    BOUNDS = split_by_orbital_period.period_bounds(100, 250, 20)
+
+    DATA = {
+        "islLinks": [
+            {"satA": 0, "satB": 1, "timeSeries": [
+                {"timestamp": t, "distance_km": 600.0, "latency_ms": 3.0}
+                for t in (0, 80, 100, 240)]},
+            {"satA": 1, "satB": 2, "timeSeries": [
+                {"timestamp": 120, "distance_km": 700.0, "latency_ms": 4.0}]},
+        ],
+        "gsLinks": {
+            "events": [
+                {"t": 150, "action": "handover", "gsId": "gs0", "fromSatId": 0, "toSatId": 1},
+                {"t": 20, "action": "connect", "gsId": "gs0", "satId": 0, "latency_ms": 5.0},
+            ],
+            "timeline": [
+                {"gsId": "gs0", "satId": 0, "startTime": 20, "endTime": 150,
+                 "samples": [{"t": 20, "latency_ms": 5.0}, {"t": 140, "latency_ms": 5.5}]},
+            ],
+        },
+    }
+
+    def test_period_bounds(self):
+        assert self.BOUNDS == [(0, 100), (100, 200), (200, 270)]
+
+    def test_boundary_sample_goes_to_next_period(self):
+        buckets = split_by_orbital_period.bucketize(self.DATA, self.BOUNDS)
+        assert [s["timestamp"] for s in buckets[0]["islLinks"][0]["timeSeries"]] == [0, 80]
+        assert [s["timestamp"] for s in buckets[1]["islLinks"][0]["timeSeries"]] == [0]
+
+    def test_links_keep_input_order(self):
+        buckets = split_by_orbital_period.bucketize(self.DATA, self.BOUNDS)
+        assert [(l["satA"], l["satB"]) for l in buckets[1]["islLinks"]] == [(0, 1), (1, 2)]
+        assert [(l["satA"], l["satB"]) for l in buckets[2]["islLinks"]] == [(0, 1)]
+
+    def test_initial_connect_injected(self):
+        buckets = split_by_orbital_period.bucketize(self.DATA, self.BOUNDS)
+        events = buckets[1]["events"]
+        assert events[0] == {"t": 0, "gsId": "gs0", "action": "connect",
+                             "satId": 0, "latency_ms": 5.0}
+        assert events[1]["action"] == "handover" and events[1]["t"] == 50
+
+    def test_timeline_trimmed_per_period(self):
+        buckets = split_by_orbital_period.bucketize(self.DATA, self.BOUNDS)
+        first, second = buckets[0]["timeline"][0], buckets[1]["timeline"][0]
+        assert (first["startTime"], first["endTime"]) == (20, 100)
+        assert (second["startTime"], second["endTime"]) == (0, 50)
+        assert second["samples"] == [{"t": 40, "latency_ms": 5.5}]
+        assert buckets[2]["timeline"] == []
+
+    def test_unsorted_series_same_buckets(self):
+        data = {"islLinks": [dict(self.DATA["islLinks"][0],
+                                  timeSeries=self.DATA["islLinks"][0]["timeSeries"][::-1])]}
+        buckets = split_by_orbital_period.bucketize(data, self.BOUNDS)
+        assert [s["timestamp"] for s in buckets[0]["islLinks"][0]["timeSeries"]] == [80, 0]
+        assert [s["timestamp"] for s in buckets[2]["islLinks"][0]["timeSeries"]] == [40]
+
+    def test_sample_values_passed_through(self):
+        """Valeurs entières, None ou absentes ressorties telles quelles."""
+        data = {"islLinks": [{"satA": 0, "satB": 1, "timeSeries": [
+            {"timestamp": 0, "distance_km": 600, "latency_ms": None},
+            {"timestamp": 20, "distance_km": 610},
+        ]}]}
+        ts = split_by_orbital_period.bucketize(data, self.BOUNDS)[0]["islLinks"][0]["timeSeries"]
+        assert [s["distance_km"] for s in ts] == [600, 610]
+        assert all(type(s["distance_km"]) is int for s in ts)
+        assert [s["latency_ms"] for s in ts] == [None, None]
+
+    def test_empty_input_is_decode_error(self, tmp_path):
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+        with pytest.raises(json.JSONDecodeError):
+            split_by_orbital_period.load_json(path)
+
+
+# ── Test 12 : Lot de connexions GS (ordre des callbacks) ─────────────────────
+
+class _FakeIntf:
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeLink:
+    def __init__(self, a, b, n):
+        self.intf1 = _FakeIntf(f"{a.name}-eth{n}")
+        self.intf2 = _FakeIntf(f"{b.name}-eth{n}")
+
+
+class _FakeProc:
+    def communicate(self, _input):
+        return b"", None
+
+
+class _FakeHost:
+    def __init__(self, name):
+        self.name = name
+
+    def popen(self, *args, **kwargs):
+        return _FakeProc()
+
+
+class _FakeNet:
+    def __init__(self):
+        self.links = 0
+
+    def addLink(self, a, b, **kwargs):
+        self.links += 1
+        return _FakeLink(a, b, self.links)
+
+    def delLink(self, link):
+        pass
+
+
+@pytest.fixture
+def mininet_gs_timeseries(monkeypatch):
+    """Importe mininet_gs_timeseries avec des modules mininet factices :
+    à l'import, seuls les noms de mininet.net/link/log sont nécessaires."""
+    noop = lambda *args, **kwargs: None
+    stubs = {
+        "mininet": {},
+        "mininet.net": {"Mininet": object},
+        "mininet.link": {"TCLink": object},
+        "mininet.log": {"setLogLevel": noop, "info": noop, "warn": noop, "error": noop},
+    }
+    for name, attrs in stubs.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        monkeypatch.setitem(sys.modules, name, module)
+    for name in ("mininet_gs_timeseries", "mininet_common", "isis_routing",
+                 "isis_metrics_collector"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module("mininet_gs_timeseries")
+
+
+class TestGSLinkBatch:
+    """Callbacks de DynamicGSLinkManager dans l'ordre des événements,
+    même quand connect et handover tombent dans la même fenêtre de mise à jour."""
+
+    def test_connect_then_handover_in_one_window(self, mininet_gs_timeseries):
+        DynamicGSLinkManager = mininet_gs_timeseries.DynamicGSLinkManager
+
+        manager = DynamicGSLinkManager(
+            _FakeNet(), {"gs0": _FakeHost("gs0")},
+            {1: _FakeHost("sat1"), 2: _FakeHost("sat2")},
+        )
+        log = []
+        manager.register_connect_callback(lambda gs, sat, lat: log.append(("connect", gs, sat)))
+        manager.register_handover_callback(
+            lambda gs, src, dst, lat: log.append(("handover", gs, src, dst)))
+
+        manager.begin_batch()
+        manager.connect("gs0", 1, 5.0)
+        manager.handover("gs0", 1, 2, 6.0)
+        manager.flush_batch()
+
+        assert log == [("connect", "gs0", 1), ("handover", "gs0", 1, 2), ("connect", "gs0", 2)]
+        assert manager.get_active_connections() == {"gs0": 2}